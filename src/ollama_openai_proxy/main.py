@@ -77,6 +77,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         # Store in app state
         app.state.settings = settings
         app.state.openai_service = openai_service
+        app.state.tags_cache = tags.TagsCache()
 
         yield
 
@@ -87,6 +88,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         # Cleanup
         if hasattr(app.state, "openai_service"):
             await app.state.openai_service.close()
+        # Cached model lists belong to this service's lifetime
+        if hasattr(app.state, "tags_cache"):
+            delattr(app.state, "tags_cache")
         logger.info("Shutting down Ollama-OpenAI Proxy Service")
 
 
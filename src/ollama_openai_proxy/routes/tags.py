@@ -1,7 +1,8 @@
 """Tags endpoint for listing models."""
+import asyncio
 import logging
 import time
-from typing import Annotated
+from typing import Annotated, Awaitable, Callable, Optional, Tuple
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Response
 
@@ -14,6 +15,57 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["Models"])
 
+# Seconds a translated model list is served from memory; matches the Cache-Control max-age
+TAGS_CACHE_TTL = 300.0
+
+
+class TagsCache:
+    """In-memory cache for the translated /api/tags response.
+
+    Concurrent misses are serialized behind a lock, so only the first one
+    calls upstream and the rest are served what it stored. Failures are
+    never cached: the next request simply tries again.
+    """
+
+    def __init__(self, ttl: float = TAGS_CACHE_TTL, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty cache whose entries live for ttl seconds of clock time."""
+        self.ttl = ttl
+        self._clock = clock
+        self._response: Optional[OllamaTagsResponse] = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> Optional[OllamaTagsResponse]:
+        """Return the cached response if it has not expired."""
+        if self._response is not None and self._clock() < self._expires:
+            return self._response
+        return None
+
+    async def get(self, fetch: Callable[[], Awaitable[OllamaTagsResponse]]) -> Tuple[OllamaTagsResponse, bool]:
+        """
+        Return the cached response, calling fetch to refill it when stale.
+
+        Args:
+            fetch: Coroutine function producing a fresh response
+
+        Returns:
+            Tuple[OllamaTagsResponse, bool]: The response and whether it was a cache hit
+        """
+        cached = self._fresh()
+        if cached is not None:
+            return cached, True
+
+        async with self._lock:
+            # Another request may have refilled the cache while this one waited
+            cached = self._fresh()
+            if cached is not None:
+                return cached, True
+
+            ollama_response = await fetch()
+            self._response = ollama_response
+            self._expires = self._clock() + self.ttl
+            return ollama_response, False
+
 
 async def get_settings() -> Settings:
     """Dependency to get settings from app state."""
@@ -29,6 +81,24 @@ async def get_openai_service() -> OpenAIService:
     return app.state.openai_service  # type: ignore[no-any-return]
 
 
+async def get_tags_cache() -> Optional[TagsCache]:
+    """Dependency to get the /api/tags cache from app state, if one is configured."""
+    from ..main import app
+
+    return getattr(app.state, "tags_cache", None)  # type: ignore[no-any-return]
+
+
+async def _fetch_tags(openai_service: OpenAIService) -> OllamaTagsResponse:
+    """Fetch models from OpenAI and translate them to Ollama format."""
+    openai_models = await openai_service.list_models()
+
+    # Translate to Ollama format using enhanced service
+    return EnhancedTranslationService.translate_with_metadata(
+        openai_models,
+        include_metadata=False,  # Keep response lean for now
+    )
+
+
 @router.get(
     "/tags",
     response_model=OllamaTagsResponse,
@@ -42,6 +112,7 @@ async def list_models(
     response: Response,
     settings: Annotated[Settings, Depends(get_settings)],
     openai_service: Annotated[OpenAIService, Depends(get_openai_service)],
+    tags_cache: Annotated[Optional[TagsCache], Depends(get_tags_cache)],
     user_agent: Annotated[str | None, Header()] = None,
 ) -> OllamaTagsResponse:
     """
@@ -55,17 +126,15 @@ async def list_models(
     logger.info("Listing models", extra={"endpoint": "/api/tags", "user_agent": user_agent})
 
     try:
-        # Fetch models from OpenAI
-        openai_models = await openai_service.list_models()
-
-        # Translate to Ollama format using enhanced service
-        ollama_response = EnhancedTranslationService.translate_with_metadata(
-            openai_models,
-            include_metadata=False,  # Keep response lean for now
-        )
+        # Fetch models from OpenAI, or reuse a recent translation
+        if tags_cache is None:
+            ollama_response, cache_hit = await _fetch_tags(openai_service), False
+        else:
+            ollama_response, cache_hit = await tags_cache.get(lambda: _fetch_tags(openai_service))
 
         # Add cache headers to reduce API calls
         response.headers["Cache-Control"] = "public, max-age=300"  # Cache for 5 minutes
+        response.headers["X-Cache"] = "HIT" if cache_hit else "MISS"
         response.headers["X-Model-Count"] = str(len(ollama_response.models))
 
         # Log performance metrics
@@ -75,6 +144,7 @@ async def list_models(
             extra={
                 "endpoint": "/api/tags",
                 "model_count": len(ollama_response.models),
+                "cache_hit": cache_hit,
                 "duration_ms": round(duration_ms, 2),
             },
         )
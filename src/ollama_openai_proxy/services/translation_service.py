@@ -1,7 +1,8 @@
 """Translation service for converting between Ollama and OpenAI formats."""
 import logging
+import re
 from datetime import datetime
-from typing import ClassVar, Dict, List
+from typing import ClassVar, Dict, List, Pattern, Tuple
 
 from openai.types import Model
 
@@ -28,6 +29,15 @@ class TranslationService:
         "text-embedding-3-large": 600_000_000,
     }
 
+    # Include chat and embedding models
+    _INCLUDE_PREFIXES: ClassVar[Tuple[str, ...]] = ("gpt-", "text-embedding-", "chatgpt-", "o1-", "o3-")
+
+    # Exclude deprecated or special models
+    _EXCLUDE_RE: ClassVar[Pattern[str]] = re.compile(r"deprecated|preview|instruct|davinci|curie|babbage")
+
+    # Also exclude old model names that start with these
+    _EXCLUDE_STARTS: ClassVar[Tuple[str, ...]] = ("text-ada-", "code-ada-", "ada-")
+
     @classmethod
     def openai_to_ollama_model(cls, openai_model: Model) -> OllamaModel:
         """
@@ -90,8 +100,8 @@ class TranslationService:
 
         return OllamaTagsResponse(models=ollama_models)
 
-    @staticmethod
-    def _should_include_model(model: Model) -> bool:
+    @classmethod
+    def _should_include_model(cls, model: Model) -> bool:
         """
         Determine if a model should be included in Ollama response.
 
@@ -101,24 +111,11 @@ class TranslationService:
         Returns:
             bool: True if model should be included
         """
-        # Include chat and embedding models
-        include_prefixes = ("gpt-", "text-embedding-", "chatgpt-", "o1-", "o3-")
-
-        # Exclude deprecated or special models
-        exclude_keywords = ("deprecated", "preview", "instruct", "davinci", "curie", "babbage")
-
-        # Also exclude old model names that start with these
-        exclude_starts = ("text-ada-", "code-ada-", "ada-")
-
         model_id_lower = model.id.lower()
 
         # Check exclusions first
-        if any(keyword in model_id_lower for keyword in exclude_keywords):
-            return False
-
-        # Check if model starts with excluded patterns
-        if any(model_id_lower.startswith(prefix) for prefix in exclude_starts):
+        if cls._EXCLUDE_RE.search(model_id_lower) or model_id_lower.startswith(cls._EXCLUDE_STARTS):
             return False
 
         # Check inclusions
-        return any(model_id_lower.startswith(prefix) for prefix in include_prefixes)
+        return model_id_lower.startswith(cls._INCLUDE_PREFIXES)
@@ -2,25 +2,58 @@
 import logging
 import uuid
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from typing import Any, Dict, Optional
 
 from fastapi import Request
 from ollama_openai_proxy.models.ollama import OllamaErrorDetails, OllamaErrorResponse
-from openai import (
-    APIConnectionError,
-    APIStatusError,
-    AuthenticationError,
-    BadRequestError,
-    ConflictError,
-    InternalServerError,
-    NotFoundError,
-    PermissionDeniedError,
-    RateLimitError,
-    UnprocessableEntityError,
-)
 
 logger = logging.getLogger(__name__)
 
+# OpenAI SDK exception classes, imported on first use by translate_openai_error
+_OAI_ERRORS: Optional[SimpleNamespace] = None
+
+
+def _load_openai_errors() -> SimpleNamespace:
+    """Import the OpenAI SDK exception classes once and cache them.
+
+    Returns:
+        Namespace exposing the exception classes by their SDK names
+    """
+    global _OAI_ERRORS
+    if _OAI_ERRORS is None:
+        from openai import (
+            APIConnectionError,
+            APIStatusError,
+            AuthenticationError,
+            BadRequestError,
+            ConflictError,
+            InternalServerError,
+            NotFoundError,
+            PermissionDeniedError,
+            RateLimitError,
+            UnprocessableEntityError,
+        )
+
+        _OAI_ERRORS = SimpleNamespace(
+            RateLimitError=RateLimitError,
+            AuthenticationError=AuthenticationError,
+            NotFoundError=NotFoundError,
+            BadRequestError=BadRequestError,
+            PermissionDeniedError=PermissionDeniedError,
+            ConflictError=ConflictError,
+            UnprocessableEntityError=UnprocessableEntityError,
+            InternalServerError=InternalServerError,
+            APIConnectionError=APIConnectionError,
+            APIStatusError=APIStatusError,
+        )
+    return _OAI_ERRORS
+
+
+def _utc_now_z() -> str:
+    """Return the current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
 
 def generate_correlation_id() -> str:
     """Generate a unique correlation ID for request tracking."""
@@ -54,6 +87,8 @@ def translate_openai_error(
     Returns:
         Dictionary with Ollama error format
     """
+    oai = _load_openai_errors()
+
     if not correlation_id:
         correlation_id = generate_correlation_id()
 
@@ -64,7 +99,7 @@ def translate_openai_error(
     details = {}
 
     # Map specific OpenAI errors
-    if isinstance(error, RateLimitError):
+    if isinstance(error, oai.RateLimitError):
         error_type = "rate_limit_error"
         status_code = 429
         message = "Rate limit exceeded. Please try again later."
@@ -74,49 +109,49 @@ def translate_openai_error(
             if retry_after:
                 details["retry_after"] = int(retry_after)
 
-    elif isinstance(error, AuthenticationError):
+    elif isinstance(error, oai.AuthenticationError):
         error_type = "authentication_error"
         status_code = 401
         message = "Authentication failed. Please check your API key."
 
-    elif isinstance(error, NotFoundError):
+    elif isinstance(error, oai.NotFoundError):
         error_type = "model_not_found"
         status_code = 404
         message = f"The model '{model or 'requested'}' does not exist or you do not have access to it."
 
-    elif isinstance(error, BadRequestError):
+    elif isinstance(error, oai.BadRequestError):
         error_type = "invalid_request_error"
         status_code = 400
         message = "Invalid request parameters."
         if hasattr(error, "body") and isinstance(error.body, dict):
             details = error.body.get("error", {}).get("details", {})
 
-    elif isinstance(error, PermissionDeniedError):
+    elif isinstance(error, oai.PermissionDeniedError):
         error_type = "permission_denied"
         status_code = 403
         message = "Permission denied. You do not have access to this resource."
 
-    elif isinstance(error, ConflictError):
+    elif isinstance(error, oai.ConflictError):
         error_type = "conflict_error"
         status_code = 409
         message = "Request conflicts with current state."
 
-    elif isinstance(error, UnprocessableEntityError):
+    elif isinstance(error, oai.UnprocessableEntityError):
         error_type = "validation_error"
         status_code = 422
         message = "Request validation failed."
 
-    elif isinstance(error, InternalServerError):
+    elif isinstance(error, oai.InternalServerError):
         error_type = "internal_server_error"
         status_code = 500
         message = "An internal server error occurred."
 
-    elif isinstance(error, APIConnectionError):
+    elif isinstance(error, oai.APIConnectionError):
         error_type = "connection_error"
         status_code = 503
         message = "Failed to connect to the API service."
 
-    elif isinstance(error, APIStatusError):
+    elif isinstance(error, oai.APIStatusError):
         # Generic API status error
         status_code = error.status_code if hasattr(error, "status_code") else 500
         error_type = f"api_error_{status_code}"
@@ -139,23 +174,18 @@ def translate_openai_error(
     )
 
     # Build Ollama error response
-    error_response = {
+    error_response: Dict[str, Any] = {
         "error": {
             "message": message,
             "type": error_type,
             "code": status_code,
+            **({"details": details} if details else {}),
         },
         "correlation_id": correlation_id,
-        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "created_at": _utc_now_z(),
+        **({"model": model} if model else {}),
     }
 
-    if details:
-        # Type ignore needed as dict construction is dynamic
-        error_response["error"]["details"] = details  # type: ignore[index]
-
-    if model:
-        error_response["model"] = model
-
     return error_response
 
 
@@ -194,7 +224,7 @@ def create_ollama_error_response(
         error=error_details,
         correlation_id=correlation_id,
         model=model,
-        created_at=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        created_at=_utc_now_z(),
     )
 
 
@@ -245,7 +275,7 @@ def handle_streaming_error(
     # Create error chunk in streaming format
     error_chunk = {
         "model": model,
-        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "created_at": _utc_now_z(),
         "response": "",  # Empty response
         "done": True,
         "error": str(error),
@@ -2,8 +2,9 @@
 import asyncio
 import os
 import sys
-from typing import Any, AsyncGenerator, Generator
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Optional
+from unittest.mock import AsyncMock
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -11,10 +12,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 import pytest  # noqa: E402
 import pytest_asyncio  # noqa: E402
 from fastapi.testclient import TestClient  # noqa: E402
-from httpx import AsyncClient  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
 from ollama_openai_proxy.config import Settings, get_settings  # noqa: E402
 from ollama_openai_proxy.main import app  # noqa: E402
-from ollama_openai_proxy.services.openai_service import OpenAIService  # noqa: E402
 
 # Test environment setup - only set if not already set
 # Skip setting OPENAI_API_KEY to allow testing missing key scenarios
@@ -25,7 +25,7 @@ if "LOG_LEVEL" not in os.environ:
 # Event loop handled by pytest-asyncio
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_settings() -> Any:
     """Create mock settings for testing."""
     settings = Settings(
@@ -56,30 +56,52 @@ def test_client(mock_openai_service: Any) -> Generator[TestClient, None, None]:
 @pytest_asyncio.fixture
 async def async_client() -> AsyncGenerator[AsyncClient, None]:
     """Create async test client."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         yield client
 
 
 @pytest.fixture
 def mock_openai_service(mock_settings: Any) -> Any:
-    """Create mock OpenAI service."""
-    service = MagicMock(spec=OpenAIService)
-    service.settings = mock_settings
-    service._request_count = 0
-    service._error_count = 0
+    """Create mock OpenAI service.
+
+    A plain namespace with only the methods the routes call is much cheaper
+    to build per test than a MagicMock that introspects OpenAIService.
+    """
+    return SimpleNamespace(
+        settings=mock_settings,
+        _request_count=0,
+        _error_count=0,
+        list_models=AsyncMock(),
+        create_chat_completion=AsyncMock(),
+        create_chat_completion_stream=AsyncMock(),
+        create_embedding=AsyncMock(),
+        health_check=AsyncMock(),
+        close=AsyncMock(),
+    )
 
-    # Mock methods
-    service.list_models = AsyncMock()
-    service.create_chat_completion = AsyncMock()
-    service.create_chat_completion_stream = AsyncMock()
-    service.create_embedding = AsyncMock()
-    service.health_check = AsyncMock()
-    service.close = AsyncMock()
 
-    return service
+@pytest.fixture(scope="session")
+def make_openai_error() -> Callable[..., Exception]:
+    """Create a factory for OpenAI SDK status errors.
 
+    The SDK exceptions only read status_code, headers and request from the
+    response, so a SimpleNamespace stands in for a much costlier MagicMock.
+    """
 
-@pytest.fixture
+    def _make(
+        exc_cls: Any,
+        status: int,
+        message: str,
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Exception:
+        response = SimpleNamespace(status_code=status, headers=headers or {}, request=SimpleNamespace())
+        return exc_cls(message=message, response=response, body=body if body is not None else {})
+
+    return _make
+
+
+@pytest.fixture(scope="session")
 def mock_openai_models() -> Any:
     """Create mock OpenAI model responses."""
     from openai.types import Model
@@ -91,23 +113,7 @@ def mock_openai_models() -> Any:
     ]
 
 
-@pytest.fixture
-def mock_ollama_client(monkeypatch: Any) -> Any:
-    """Create mock Ollama client for SDK tests."""
-    # Only create if ollama is installed
-    try:
-        import ollama
-
-        # Set test URL
-        monkeypatch.setenv("OLLAMA_HOST", "http://localhost:11434")
-
-        client = ollama.Client(host="http://localhost:11434")
-        return client
-    except ImportError:
-        pytest.skip("ollama package not installed")
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_openai_completion() -> Any:
     """Create mock OpenAI completion response."""
     from openai.types.chat import ChatCompletion, ChatCompletionMessage
@@ -131,51 +137,25 @@ def mock_openai_completion() -> Any:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_openai_streaming() -> Any:
     """Create mock OpenAI streaming response."""
     from openai.types.chat import ChatCompletionChunk
     from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
 
-    async def stream_generator() -> AsyncGenerator[Any, None]:
-        chunks = [
-            ChatCompletionChunk(
-                id="chatcmpl-test123",
-                object="chat.completion.chunk",
-                created=1234567890,
-                model="gpt-3.5-turbo",
-                choices=[Choice(index=0, delta=ChoiceDelta(content="The"), finish_reason=None)],
-            ),
-            ChatCompletionChunk(
-                id="chatcmpl-test123",
-                object="chat.completion.chunk",
-                created=1234567890,
-                model="gpt-3.5-turbo",
-                choices=[Choice(index=0, delta=ChoiceDelta(content=" sky"), finish_reason=None)],
-            ),
-            ChatCompletionChunk(
-                id="chatcmpl-test123",
-                object="chat.completion.chunk",
-                created=1234567890,
-                model="gpt-3.5-turbo",
-                choices=[Choice(index=0, delta=ChoiceDelta(content=" is"), finish_reason=None)],
-            ),
-            ChatCompletionChunk(
-                id="chatcmpl-test123",
-                object="chat.completion.chunk",
-                created=1234567890,
-                model="gpt-3.5-turbo",
-                choices=[Choice(index=0, delta=ChoiceDelta(content=" blue"), finish_reason=None)],
-            ),
-            ChatCompletionChunk(
-                id="chatcmpl-test123",
-                object="chat.completion.chunk",
-                created=1234567890,
-                model="gpt-3.5-turbo",
-                choices=[Choice(index=0, delta=ChoiceDelta(content=""), finish_reason="stop")],
-            ),
-        ]
+    # Built once per session; every call replays the same chunk objects
+    chunks = [
+        ChatCompletionChunk(
+            id="chatcmpl-test123",
+            object="chat.completion.chunk",
+            created=1234567890,
+            model="gpt-3.5-turbo",
+            choices=[Choice(index=0, delta=ChoiceDelta(content=content), finish_reason=finish_reason)],
+        )
+        for content, finish_reason in [("The", None), (" sky", None), (" is", None), (" blue", None), ("", "stop")]
+    ]
 
+    async def stream_generator(*args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
         for chunk in chunks:
             yield chunk
 
@@ -185,11 +165,18 @@ def mock_openai_streaming() -> Any:
 @pytest.fixture(autouse=True)
 def reset_app_state() -> Generator[None, None, None]:
     """Reset app state between tests."""
+    # The integration suite's in-process proxy is serving this app; its state must outlive each test
+    if getattr(app.state, "in_process_server", False):
+        yield
+        return
+
     # Clear any existing state
     if hasattr(app.state, "settings"):
         delattr(app.state, "settings")
     if hasattr(app.state, "openai_service"):
         delattr(app.state, "openai_service")
+    if hasattr(app.state, "tags_cache"):
+        delattr(app.state, "tags_cache")
 
     yield
 
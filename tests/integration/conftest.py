@@ -0,0 +1,278 @@
+"""Fixtures shared by the integration and Ollama SDK tests."""
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Callable, Generator, List, Optional, Tuple
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import pytest_asyncio
+import requests
+from dotenv import load_dotenv
+from filelock import FileLock
+
+# Repository root, used as the spawned server's working directory
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Proxy an externally started server listens on (e.g., in CI)
+DEFAULT_HOST = "http://localhost:11434"
+STARTUP_TIMEOUT = 30  # seconds to wait for server startup
+
+# Reuse a proxy that is already listening instead of spawning one (set to 0 to always spawn)
+REUSE_EXTERNAL = os.getenv("PROXY_REUSE_EXTERNAL", "1") != "0"
+
+# Serve the app with uvicorn on a thread of the test process, against a mocked upstream, instead of a subprocess
+IN_PROCESS = os.getenv("PROXY_IN_PROCESS", "0") == "1"
+
+
+# Placeholder key used by local .env templates; it cannot reach the real API
+PLACEHOLDER_API_KEY = "test-key-12345"
+
+
+def pytest_collection_modifyitems(config: Any, items: List[Any]) -> None:
+    """Skip requires_api_key tests up front when no real OpenAI API key is configured."""
+    # Load .env once, at collection, before any test or fixture runs (existing variables win)
+    load_dotenv()
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if api_key and api_key != PLACEHOLDER_API_KEY:
+        return
+
+    skip = pytest.mark.skip(reason="Real OpenAI API key required")
+    for item in items:
+        if "requires_api_key" in item.keywords:
+            item.add_marker(skip)
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        return int(sock.getsockname()[1])
+
+
+def _server_healthy(host: str) -> bool:
+    """Return True if a proxy at host is answering health checks."""
+    try:
+        response = requests.get(f"{host}/health", timeout=0.2)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    """Spawn the proxy server on port and wait until it reports healthy."""
+    # Set up environment variables
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "test-key"),
+        "OPENAI_API_BASE_URL": "https://api.openai.com/v1",
+        "PROXY_PORT": str(port),
+        "LOG_LEVEL": "INFO",
+    }
+
+    # Output goes to files rather than pipes: a full PIPE nobody drains would block the server on write
+    log_out = tempfile.NamedTemporaryFile(mode="w", prefix="proxy-", suffix=".stdout", delete=False)
+    log_err = tempfile.NamedTemporaryFile(mode="w", prefix="proxy-", suffix=".stderr", delete=False)
+    with log_out, log_err:
+        # Start the server using the current Python interpreter
+        process = subprocess.Popen(
+            [sys.executable, "-m", "ollama_openai_proxy.main"],
+            env=env,
+            stdout=log_out,
+            stderr=log_err,
+            cwd=REPO_ROOT,
+        )
+
+    def _output() -> str:
+        return f"STDOUT: {Path(log_out.name).read_text()}\nSTDERR: {Path(log_err.name).read_text()}"
+
+    # Poll /health until the socket is bound, failing fast if the server exits (e.g., port already in use)
+    host = f"http://localhost:{port}"
+    deadline = time.time() + STARTUP_TIMEOUT
+    while not _server_healthy(host):
+        if process.poll() is not None:
+            pytest.fail(f"Server exited during startup with code {process.returncode}.\n{_output()}")
+        if time.time() > deadline:
+            process.terminate()
+            process.wait(timeout=5)
+            pytest.fail(f"Server failed to start within {STARTUP_TIMEOUT} seconds.\n{_output()}")
+        time.sleep(0.1)
+    return process
+
+
+def _mock_openai_service(request: Any) -> Any:
+    """Canned OpenAI upstream for the in-process proxy, built from the root conftest's mock responses."""
+    from openai.types import CreateEmbeddingResponse, Embedding
+    from openai.types.create_embedding_response import Usage
+
+    async def _create_embedding(model: str, input: str, **kwargs: Any) -> CreateEmbeddingResponse:
+        # Deterministic per input, so equal prompts match and different prompts differ
+        digest = hashlib.sha256(input.encode()).digest()
+        vector = [b / 255 - 0.5 for b in digest] * 48  # 1536 dimensions, like ada-002
+        return CreateEmbeddingResponse(
+            data=[Embedding(embedding=vector, index=0, object="embedding")],
+            model=model,
+            object="list",
+            usage=Usage(prompt_tokens=1, total_tokens=1),
+        )
+
+    return SimpleNamespace(
+        list_models=AsyncMock(return_value=request.getfixturevalue("mock_openai_models")),
+        create_chat_completion=AsyncMock(return_value=request.getfixturevalue("mock_openai_completion")),
+        create_chat_completion_stream=request.getfixturevalue("mock_openai_streaming"),
+        create_embedding=AsyncMock(side_effect=_create_embedding),
+        health_check=AsyncMock(return_value={"status": "healthy", "models_available": 3}),
+        close=AsyncMock(),
+    )
+
+
+def _start_in_process_server(port: int, request: Any) -> Tuple[Any, threading.Thread]:
+    """Serve the proxy app against a mocked upstream on a uvicorn thread and wait until it is serving.
+
+    The app's own lifespan would build real settings and an OpenAI client, so it
+    is turned off and mocked state is installed on app.state instead.
+    """
+    import uvicorn
+    from ollama_openai_proxy.main import app
+    from ollama_openai_proxy.routes.tags import TagsCache
+
+    app.state.settings = request.getfixturevalue("mock_settings")
+    app.state.openai_service = _mock_openai_service(request)
+    app.state.tags_cache = TagsCache()
+    app.state.startup_time = time.time()
+    # Tells the root reset_app_state fixture to leave this state alone while the server runs
+    app.state.in_process_server = True
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, name="proxy-server", daemon=True)
+    thread.start()
+
+    deadline = time.time() + STARTUP_TIMEOUT
+    while not server.started:
+        if not thread.is_alive() or time.time() > deadline:
+            pytest.fail(f"In-process proxy server failed to start within {STARTUP_TIMEOUT} seconds")
+        time.sleep(0.025)
+    return server, thread
+
+
+def _clear_in_process_state() -> None:
+    """Remove the state _start_in_process_server installed on the shared app."""
+    from ollama_openai_proxy.main import app
+
+    for name in ("settings", "openai_service", "tags_cache", "startup_time", "in_process_server"):
+        if hasattr(app.state, name):
+            delattr(app.state, name)
+
+
+@pytest.fixture(scope="session")
+def _proxy_server(request: Any, tmp_path_factory: Any) -> Generator[Tuple[str, Optional[subprocess.Popen]], None, None]:
+    """Provide a running proxy for the session as (host, process).
+
+    A proxy already answering on the default port is reused. Otherwise each
+    session, and so each xdist worker, starts its own proxy on its own free
+    ephemeral port. The file lock shared by all workers only serializes port
+    selection and startup, so no two workers pick the same port before it is
+    bound; the proxies themselves are not shared. With PROXY_IN_PROCESS=1 the
+    app runs on a uvicorn thread against a mocked OpenAI upstream and process
+    is None.
+    """
+    host = DEFAULT_HOST
+    process = None
+    in_process = None
+    lock_path = tmp_path_factory.getbasetemp().parent / "proxy_server.lock"
+    with FileLock(str(lock_path)):
+        # Reuse a server that is already running (e.g., in CI)
+        if not (REUSE_EXTERNAL and _server_healthy(DEFAULT_HOST)):
+            port = _free_port()
+            host = f"http://localhost:{port}"
+            if IN_PROCESS:
+                in_process = _start_in_process_server(port, request)
+            else:
+                process = _start_server(port)
+
+    try:
+        yield host, process
+    finally:
+        # Run every cleanup step even if an earlier one fails, so no proxy is left holding the port
+        steps: List[Callable[[], Any]] = []
+        if in_process is not None:
+            server, thread = in_process
+            steps += [
+                lambda: setattr(server, "should_exit", True),
+                lambda: thread.join(timeout=5),
+                _clear_in_process_state,
+            ]
+        if process is not None:
+            steps += [process.terminate, lambda: process.wait(timeout=5), process.kill, lambda: process.wait(timeout=2)]
+
+        errors = []
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            warnings.warn(f"Proxy server teardown reported {len(errors)} error(s): {errors!r}", stacklevel=1)
+
+
+@pytest.fixture(scope="session")
+def server_process(_proxy_server: Tuple[str, Optional[subprocess.Popen]]) -> Optional[subprocess.Popen]:
+    """Proxy subprocess started for this session, or None if reused or in-process."""
+    return _proxy_server[1]
+
+
+@pytest.fixture(scope="session")
+def server_host(_proxy_server: Tuple[str, Optional[subprocess.Popen]]) -> str:
+    """Base URL of the proxy the SDK tests should talk to."""
+    return _proxy_server[0]
+
+
+@pytest.fixture(scope="session")
+def ollama_client(server_host: str) -> Generator[Any, None, None]:
+    """Ollama SDK client bound to the session's proxy, sharing one keep-alive pool across tests."""
+    ollama = pytest.importorskip("ollama", reason="ollama package required for SDK tests")
+    # Keep idle connections around between tests rather than httpx's 5s default
+    limits = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30.0)
+    client = ollama.Client(host=server_host, timeout=30, limits=limits)
+    yield client
+    client._client.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def ollama_async_client(server_host: str) -> AsyncGenerator[Any, None]:
+    """Async Ollama SDK client for session-loop tests, pooled for up to 16 concurrent requests.
+
+    Its connections belong to the session event loop, so tests using it must
+    run with ``@pytest.mark.asyncio(scope="session")``.
+    """
+    ollama = pytest.importorskip("ollama", reason="ollama package required for SDK tests")
+    limits = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+    client = ollama.AsyncClient(host=server_host, limits=limits)
+    yield client
+    await client._client.aclose()
+
+
+@pytest.fixture
+def mock_ollama_client(server_host: str, monkeypatch: Any) -> Any:
+    """Create mock Ollama client for SDK tests."""
+    # Only create if ollama is installed
+    try:
+        import ollama
+
+        # Set test URL
+        monkeypatch.setenv("OLLAMA_HOST", server_host)
+
+        client = ollama.Client(host=server_host)
+        return client
+    except ImportError:
+        pytest.skip("ollama package not installed")
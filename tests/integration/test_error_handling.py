@@ -1,21 +1,41 @@
 """Integration tests for error handling in the generate endpoint."""
-from typing import Any, Dict
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Generator
 
+import httpx
 import pytest
 
 # Skip if ollama not installed
 ollama = pytest.importorskip("ollama", reason="ollama package required for SDK tests")
 
+# Markers of Python internals that must never reach an error message
+_LEAK_RE = re.compile(r"Traceback|__")
+
+# Behaviour that cannot be triggered against a live upstream; see docs/integration-contract.md
+_DOC_ONLY = pytest.mark.skip(reason="behavioral contract documentation, see docs/integration-contract.md")
+
+
+@pytest.fixture(scope="module")
+def executor() -> Generator[ThreadPoolExecutor, None, None]:
+    """Thread pool kept alive for the whole module's concurrent tests."""
+    pool = ThreadPoolExecutor(max_workers=16)
+    yield pool
+    pool.shutdown(wait=False)
+
 
 @pytest.mark.integration
 @pytest.mark.sdk
 class TestErrorHandling:
     """Test error handling with Ollama SDK against proxy server."""
 
-    @pytest.fixture
-    def ollama_client(self) -> Any:
-        """Create Ollama client configured for our proxy."""
-        return ollama.Client(host="http://localhost:11434")
+    @pytest.fixture(scope="class")
+    def ollama_client(self, server_host: str) -> Any:
+        """One keep-alive client on the session's proxy, shared by the class (tests must not mutate it)."""
+        return ollama.Client(
+            host=server_host,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+        )
 
     def test_model_not_found_error(self, ollama_client: Any) -> None:
         """Test handling of model not found errors."""
@@ -43,12 +63,14 @@ class TestErrorHandling:
         error_str = str(exc_info.value)
         print(f"Empty prompt error: {error_str}")
 
+    @_DOC_ONLY
     def test_authentication_error_simulation(self, ollama_client: Any) -> None:
         """Test authentication error handling (requires invalid API key)."""
         # This test would need to be run with an invalid API key to trigger auth errors
         # For now, we'll just document the expected behavior
         print("Authentication errors should return 401 status with appropriate message")
 
+    @_DOC_ONLY
     def test_rate_limit_error_handling(self, ollama_client: Any) -> None:
         """Test rate limit error handling."""
         # Rate limits are hard to trigger in tests
@@ -73,12 +95,14 @@ class TestErrorHandling:
         except Exception as e:
             print(f"Streaming error caught: {e}")
 
+    @_DOC_ONLY
     def test_correlation_id_in_headers(self, ollama_client: Any) -> None:
         """Test that correlation IDs are included in error responses."""
         # The SDK might not expose response headers directly
         # This is more of a contract test requirement
         print("Correlation IDs should be included in X-Correlation-ID header")
 
+    @_DOC_ONLY
     def test_timeout_simulation(self, ollama_client: Any) -> None:
         """Test timeout handling with very long prompt."""
         # Timeouts are hard to simulate without mocking
@@ -102,14 +126,14 @@ class TestErrorHandling:
         except Exception as e:
             print(f"Invalid options error: {e}")
 
+    @_DOC_ONLY
     def test_network_error_resilience(self, ollama_client: Any) -> None:
         """Test resilience to network errors."""
         # This would require simulating network failures
         print("Network errors should return 503 Service Unavailable")
 
-    def test_concurrent_error_handling(self, ollama_client: Any) -> None:
+    def test_concurrent_error_handling(self, ollama_client: Any, executor: ThreadPoolExecutor) -> None:
         """Test error handling under concurrent requests."""
-        import concurrent.futures
 
         def make_request(model: str) -> str:
             try:
@@ -125,8 +149,7 @@ class TestErrorHandling:
         # Mix valid and invalid models
         models = ["gpt-3.5-turbo", "invalid-1", "gpt-3.5-turbo", "invalid-2"]
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            results = list(executor.map(make_request, models))
+        results = list(executor.map(make_request, models))
 
         print("\nConcurrent request results:")
         for result in results:
@@ -139,48 +162,46 @@ class TestErrorHandling:
         assert len(errors) > 0, "Should have some errors"
         assert len(successes) > 0, "Should have some successes"
 
-    def test_malformed_request_handling(self, ollama_client: Any) -> None:
+    @pytest.mark.parametrize(
+        "case",
+        [
+            {"prompt": None, "model": "gpt-3.5-turbo"},  # None prompt
+            {"prompt": ["not", "a", "string"], "model": "gpt-3.5-turbo"},  # Wrong type
+            {"prompt": "test", "model": ""},  # Empty model
+        ],
+        ids=["none_prompt", "wrong_type", "empty_model"],
+    )
+    def test_malformed_request_handling(self, ollama_client: Any, case: Dict[str, Any]) -> None:
         """Test handling of malformed requests."""
         # The SDK validates requests, but we can test edge cases
-        edge_cases: list[Dict[str, Any]] = [
-            {"prompt": None},  # None prompt
-            {"prompt": ["not", "a", "string"]},  # Wrong type
-            {"prompt": "test", "model": ""},  # Empty model
-        ]
-
-        for idx, case in enumerate(edge_cases):
-            try:
-                # SDK might handle these differently
-                test_case = dict(case)  # Create a copy
-                if "model" not in test_case:
-                    test_case["model"] = "gpt-3.5-turbo"
-
-                resp = ollama_client.generate(**test_case, stream=False)
-                print(f"Edge case {idx} succeeded unexpectedly: {resp}")
-            except Exception as e:
-                print(f"Edge case {idx} error (expected): {str(e)[:50]}...")
+        try:
+            # SDK might handle these differently
+            resp = ollama_client.generate(**case, stream=False)
+            print(f"Edge case {case} succeeded unexpectedly: {resp}")
+        except Exception as e:
+            print(f"Edge case {case} error (expected): {str(e)[:50]}...")
 
-    def test_error_message_clarity(self, ollama_client: Any) -> None:
-        """Test that error messages are clear and helpful."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "prompt,model,description",
+        [
             ("", "gpt-3.5-turbo", "empty prompt"),
             ("test", "no-such-model", "invalid model"),
-        ]
-
-        for prompt, model, description in test_cases:
-            try:
-                ollama_client.generate(
-                    model=model,
-                    prompt=prompt,
-                    stream=False,
-                )
-            except Exception as e:
-                error_msg = str(e)
-                print(f"\n{description.title()} error message:")
-                print(f"  {error_msg}")
-
-                # Error should be informative
-                assert len(error_msg) > 10, "Error message should be descriptive"
-                # Should not expose internal details
-                assert "Traceback" not in error_msg
-                assert "__" not in error_msg  # No Python internals
+        ],
+    )
+    def test_error_message_clarity(self, ollama_client: Any, prompt: str, model: str, description: str) -> None:
+        """Test that error messages are clear and helpful."""
+        try:
+            ollama_client.generate(
+                model=model,
+                prompt=prompt,
+                stream=False,
+            )
+        except Exception as e:
+            error_msg = str(e)
+            print(f"\n{description.title()} error message:")
+            print(f"  {error_msg}")
+
+            # Error should be informative
+            assert len(error_msg) > 10, "Error message should be descriptive"
+            # Should not expose internal details (tracebacks or Python dunder names)
+            assert not _LEAK_RE.search(error_msg), "Error leaks Python internals"
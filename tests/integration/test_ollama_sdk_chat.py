@@ -1,92 +1,32 @@
 """Integration tests for Ollama SDK chat functionality against running server."""
+import io
 import json
-import os
-import subprocess
-import sys
+import re
 import time
-from typing import Generator
 
+import httpx
 import pytest
-import requests
-from dotenv import load_dotenv
 from ollama import AsyncClient, Client
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Test configuration
 TEST_MODEL = "gpt-3.5-turbo"  # Use OpenAI model since we're proxying to OpenAI
-SERVER_HOST = "http://localhost:11434"
-STARTUP_TIMEOUT = 30  # seconds to wait for server startup
-
-
-@pytest.fixture(scope="module")
-def server_process() -> Generator[subprocess.Popen | None, None, None]:
-    """Start the proxy server for testing if not already running."""
-    # Check if server is already running (e.g., in CI)
-    try:
-        response = requests.get(f"{SERVER_HOST}/health", timeout=1)
-        if response.status_code == 200:
-            # Server is already running
-            yield None
-            return
-    except requests.exceptions.RequestException:
-        pass
-
-    # Server not running, start it
-    # Set up environment variables
-    env = os.environ.copy()
-    env["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "test-key")
-    env["OPENAI_API_BASE_URL"] = "https://api.openai.com/v1"
-    env["PROXY_PORT"] = "11434"
-    env["LOG_LEVEL"] = "INFO"
-
-    # Start the server using the current Python interpreter
-    process = subprocess.Popen(
-        [sys.executable, "-m", "ollama_openai_proxy.main"],
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-    )
-
-    # Wait for server to start
-    start_time = time.time()
-    while time.time() - start_time < STARTUP_TIMEOUT:
-        try:
-            response = requests.get(f"{SERVER_HOST}/health")
-            if response.status_code == 200:
-                break
-        except requests.exceptions.ConnectionError:
-            pass
-        time.sleep(0.5)
-    else:
-        process.terminate()
-        stdout, stderr = process.communicate(timeout=5)
-        pytest.fail(f"Server failed to start within {STARTUP_TIMEOUT} seconds.\nSTDOUT: {stdout}\nSTDERR: {stderr}")
-
-    yield process
 
-    # Cleanup
-    process.terminate()
-    try:
-        process.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        process.kill()
-        process.wait()
+# Content matchers, compiled once; plain alternations keep the original substring semantics
+_PIRATE_RE = re.compile(r"ahoy|matey|arr|aye|ye|pirates|ship|sea", re.I)
+_NAME_RE = re.compile(r"alice|your name")
+_MESSAGE_COUNT_RE = re.compile(r"5|five|messages")
 
 
-@pytest.fixture
-def client(server_process) -> Client:
-    """Create Ollama client for testing."""
-    return Client(host=SERVER_HOST)
+@pytest.fixture(scope="module")
+def client(server_host: str) -> Client:
+    """Create one Ollama client shared by the module's tests."""
+    return Client(host=server_host)
 
 
-@pytest.fixture
-def async_client(server_process) -> AsyncClient:
-    """Create async Ollama client for testing."""
-    return AsyncClient(host=SERVER_HOST)
+@pytest.fixture(scope="session")
+def async_client(server_host: str) -> AsyncClient:
+    """Create one async Ollama client for the session-scoped event loop."""
+    return AsyncClient(host=server_host)
 
 
 class TestOllamaSDKChatIntegration:
@@ -117,25 +57,29 @@ class TestOllamaSDKChatIntegration:
             stream=True,
         )
 
-        chunks = []
+        # Accumulate content as it arrives, keeping only the last chunk
+        buf = io.StringIO()
+        last = None
+        count = 0
         for chunk in stream:
-            chunks.append(chunk)
             # Verify chunk structure
             assert "message" in chunk
             assert "content" in chunk["message"]
             assert "done" in chunk
             assert "model" in chunk
             assert chunk["model"] == TEST_MODEL
+            buf.write(chunk["message"]["content"])
+            last = chunk
+            count += 1
 
         # Verify we got multiple chunks
-        assert len(chunks) > 1
+        assert count > 1
 
         # Last chunk should have done=True
-        assert chunks[-1]["done"] is True
+        assert last["done"] is True
 
-        # Concatenate all content
-        full_content = "".join(chunk["message"]["content"] for chunk in chunks)
-        assert len(full_content) > 0
+        # Verify concatenated content
+        assert len(buf.getvalue()) > 0
 
     def test_multi_turn_conversation(self, client: Client):
         """Test multi-turn conversation with context preservation."""
@@ -155,7 +99,7 @@ class TestOllamaSDKChatIntegration:
         assert "message" in response
         content = response["message"]["content"].lower()
         # Check if the assistant remembers the name (might be in various formats)
-        assert any(name in content for name in ["alice", "your name"])
+        assert _NAME_RE.search(content)
 
     def test_system_prompt_handling(self, client: Client):
         """Test system prompts are properly handled."""
@@ -172,8 +116,7 @@ class TestOllamaSDKChatIntegration:
         assert "message" in response
         content = response["message"]["content"].lower()
         # Check for common pirate words (at least one should appear)
-        pirate_words = ["ahoy", "matey", "arr", "aye", "ye", "pirates", "ship", "sea"]
-        assert any(word in content for word in pirate_words), f"Expected pirate language but got: {content}"
+        assert _PIRATE_RE.search(content), f"Expected pirate language but got: {content}"
 
     def test_chat_with_options(self, client: Client):
         """Test chat with custom options/parameters."""
@@ -193,7 +136,7 @@ class TestOllamaSDKChatIntegration:
         # Response should be relatively short due to max_tokens
         assert len(response["message"]["content"].split()) <= 10
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(scope="session")
     async def test_async_chat_basic(self, async_client: AsyncClient):
         """Test async chat functionality."""
         response = await async_client.chat(
@@ -206,7 +149,7 @@ class TestOllamaSDKChatIntegration:
         assert "message" in response
         assert "4" in response["message"]["content"] or "four" in response["message"]["content"].lower()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(scope="session")
     async def test_async_streaming_chat(self, async_client: AsyncClient):
         """Test async streaming chat."""
         stream = await async_client.chat(
@@ -215,19 +158,23 @@ class TestOllamaSDKChatIntegration:
             stream=True,
         )
 
-        chunks = []
+        # Accumulate content as it arrives, keeping only the last chunk
+        buf = io.StringIO()
+        last = None
+        count = 0
         async for chunk in stream:
-            chunks.append(chunk)
             assert "message" in chunk
             assert "done" in chunk
+            buf.write(chunk["message"]["content"])
+            last = chunk
+            count += 1
 
         # Verify we got chunks
-        assert len(chunks) > 0
-        assert chunks[-1]["done"] is True
+        assert count > 0
+        assert last["done"] is True
 
         # Verify content contains 'test'
-        full_content = "".join(chunk["message"]["content"] for chunk in chunks)
-        assert "test" in full_content.lower()
+        assert "test" in buf.getvalue().lower()
 
     def test_error_handling_empty_messages(self, client: Client):
         """Test error handling for empty messages array."""
@@ -253,27 +200,33 @@ class TestOllamaSDKChatIntegration:
         # Should get an error about invalid role
         assert "role" in str(exc_info.value).lower()
 
-    def test_performance_minimal_overhead(self, client: Client):
+    def test_performance_minimal_overhead(self, client: Client, server_host: str, record_property):
         """Test that proxy adds minimal overhead to requests."""
-        # Measure time for a simple request
-        start_time = time.time()
+        # Baseline round-trip to the proxy, so network latency is not counted as overhead
+        with httpx.Client(base_url=server_host) as http:
+            t0 = time.perf_counter()
+            http.get("/health").raise_for_status()
+            baseline = time.perf_counter() - t0
 
+        t0 = time.perf_counter()
         response = client.chat(
             model=TEST_MODEL,
             messages=[{"role": "user", "content": "Hi"}],
             stream=False,
         )
-
-        elapsed_time = time.time() - start_time
+        elapsed = time.perf_counter() - t0
+        overhead = elapsed - baseline
 
         # Verify response is valid
         assert "message" in response
 
-        # Log performance (for manual inspection)
-        print(f"\nChat request completed in {elapsed_time:.2f} seconds")
+        # Log and record performance for CI tracking; overhead still includes upstream latency,
+        # so it is tracked rather than asserted
+        print(f"\nChat request completed in {elapsed:.3f}s (health RTT {baseline:.3f}s)")
+        record_property("chat_overhead_s", overhead)
 
         # Basic sanity check - should complete within reasonable time
-        assert elapsed_time < 30, f"Request took too long: {elapsed_time} seconds"
+        assert elapsed < 30, f"Request took too long: {elapsed:.3f} seconds"
 
     def test_format_json_mode(self, client: Client):
         """Test JSON format mode."""
@@ -321,4 +274,4 @@ class TestOllamaSDKChatIntegration:
         assert "message" in response
         # Response should reference the number 5 or "five"
         content = response["message"]["content"].lower()
-        assert "5" in content or "five" in content or "messages" in content
+        assert _MESSAGE_COUNT_RE.search(content)
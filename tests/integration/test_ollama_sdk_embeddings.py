@@ -1,90 +1,68 @@
 """Integration tests for Ollama SDK embeddings functionality against running server."""
-import os
-import subprocess
-import sys
+import asyncio
 import time
+from typing import AsyncGenerator, Generator, List
 
+import httpx
+import numpy as np
 import pytest
+import pytest_asyncio
 import requests
-from dotenv import load_dotenv
 from ollama import AsyncClient, Client
-
-# Load environment variables from .env file
-load_dotenv()
+from requests.adapters import HTTPAdapter
 
 # Test configuration
 TEST_MODEL = "text-embedding-ada-002"  # Use OpenAI embedding model since we're proxying to OpenAI
-SERVER_HOST = "http://localhost:11434"
-STARTUP_TIMEOUT = 30  # seconds to wait for server startup
+EXPECTED_DIM = 1536  # text-embedding-ada-002 vector size
 
 
-@pytest.fixture(scope="module")
-def server_process():
-    """Start the proxy server for testing if not already running."""
-    # Check if server is already running (e.g., in CI)
-    try:
-        response = requests.get(f"{SERVER_HOST}/health", timeout=1)
-        if response.status_code == 200:
-            # Server is already running
-            yield None
-            return
-    except requests.exceptions.RequestException:
-        pass
-
-    # Server not running, start it
-    # Set up environment variables
-    env = os.environ.copy()
-    env["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "test-key")
-    env["OPENAI_API_BASE_URL"] = "https://api.openai.com/v1"
-    env["PROXY_PORT"] = "11434"
-    env["LOG_LEVEL"] = "INFO"
-
-    # Start the server using the current Python interpreter
-    process = subprocess.Popen(
-        [sys.executable, "-m", "ollama_openai_proxy.main"],
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+def _cosine(a, b) -> float:
+    """Cosine similarity of two embedding vectors."""
+    v1 = np.asarray(a, dtype=np.float32)
+    v2 = np.asarray(b, dtype=np.float32)
+    return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+
+
+async def embed_batch(http: httpx.AsyncClient, prompts: List[str], model: str = TEST_MODEL) -> List[List[float]]:
+    """Embed several prompts through /api/embed, returning the vectors in prompt order.
+
+    The proxy's /api/embed takes one prompt per request (no batched ``input``), so
+    the requests are sent concurrently over the caller's connection pool.
+    """
+    responses = await asyncio.gather(
+        *[http.post("/api/embed", json={"model": model, "prompt": prompt}) for prompt in prompts]
     )
+    for response in responses:
+        response.raise_for_status()
+    return [response.json()["embedding"] for response in responses]
 
-    # Wait for server to start
-    start_time = time.time()
-    while time.time() - start_time < STARTUP_TIMEOUT:
-        try:
-            response = requests.get(f"{SERVER_HOST}/health")
-            if response.status_code == 200:
-                break
-        except requests.exceptions.ConnectionError:
-            pass
-        time.sleep(0.5)
-    else:
-        process.terminate()
-        stdout, stderr = process.communicate(timeout=5)
-        pytest.fail(f"Server failed to start within {STARTUP_TIMEOUT} seconds.\nSTDOUT: {stdout}\nSTDERR: {stderr}")
-
-    yield process
-
-    # Cleanup
-    process.terminate()
-    try:
-        process.wait(timeout=5)
-    except subprocess.TimeoutExpired:
-        process.kill()
-        process.wait()
+
+@pytest.fixture(scope="module")
+def http(server_host: str) -> Generator[requests.Session, None, None]:
+    """Keep-alive HTTP session for tests that call the proxy directly."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    yield session
+    session.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def embed_http(server_host: str) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Pooled async HTTP client for embed_batch, shared across the session's event loop."""
+    async with httpx.AsyncClient(base_url=server_host, timeout=30) as http:
+        yield http
 
 
 @pytest.fixture
-def client(server_process) -> Client:
+def client(server_host: str) -> Client:
     """Create Ollama client for testing."""
-    return Client(host=SERVER_HOST)
+    return Client(host=server_host)
 
 
-@pytest.fixture
-def async_client(server_process) -> AsyncClient:
-    """Create async Ollama client for testing."""
-    return AsyncClient(host=SERVER_HOST)
+@pytest.fixture(scope="session")
+def async_client(server_host: str) -> AsyncClient:
+    """Create one async Ollama client shared across the session's event loop."""
+    return AsyncClient(host=server_host)
 
 
 class TestOllamaSDKEmbeddingsIntegration:
@@ -100,7 +78,8 @@ class TestOllamaSDKEmbeddingsIntegration:
         assert len(response["embedding"]) > 0
         assert all(isinstance(x, float) for x in response["embedding"])
 
-    def test_embeddings_with_different_prompts(self, client: Client):
+    @pytest.mark.asyncio(scope="session")
+    async def test_embeddings_with_different_prompts(self, async_client: AsyncClient):
         """Test embeddings with various prompt types."""
         test_prompts = [
             "Simple text",
@@ -110,66 +89,57 @@ class TestOllamaSDKEmbeddingsIntegration:
             "Unicode text: 你好世界 🌍",
         ]
 
-        for prompt in test_prompts:
-            response = client.embeddings(model=TEST_MODEL, prompt=prompt)
+        responses = await asyncio.gather(
+            *[async_client.embeddings(model=TEST_MODEL, prompt=prompt) for prompt in test_prompts]
+        )
 
+        for response in responses:
             assert "embedding" in response
             assert isinstance(response["embedding"], list)
             assert len(response["embedding"]) > 0
 
-    def test_embeddings_dimension_consistency(self, client: Client):
+    @pytest.mark.asyncio(scope="session")
+    async def test_embeddings_dimension_consistency(self, embed_http: httpx.AsyncClient):
         """Test that embeddings have consistent dimensions for same model."""
         # Generate embeddings for multiple prompts
         prompts = ["First prompt", "Second prompt", "Third prompt"]
-        dimensions = []
 
-        for prompt in prompts:
-            response = client.embeddings(model=TEST_MODEL, prompt=prompt)
-            dimensions.append(len(response["embedding"]))
+        # np.stack raises if the embeddings do not all have the same dimension
+        embs = np.stack([np.asarray(e, dtype=np.float32) for e in await embed_batch(embed_http, prompts)])
 
-        # All embeddings should have the same dimension
-        assert len(set(dimensions)) == 1, f"Inconsistent dimensions: {dimensions}"
+        assert embs.shape == (len(prompts), EXPECTED_DIM), f"Unexpected embedding matrix shape: {embs.shape}"
 
-    def test_embeddings_different_vectors(self, client: Client):
+    def test_embeddings_different_vectors(self, ollama_client: Client):
         """Test that different prompts produce different embeddings."""
-        prompt1 = "The quick brown fox"
-        prompt2 = "Lorem ipsum dolor sit amet"
-
-        response1 = client.embeddings(model=TEST_MODEL, prompt=prompt1)
-        response2 = client.embeddings(model=TEST_MODEL, prompt=prompt2)
-
         # Embeddings should be different
-        embedding1 = response1["embedding"]
-        embedding2 = response2["embedding"]
+        response1 = ollama_client.embeddings(model=TEST_MODEL, prompt="The quick brown fox")
+        response2 = ollama_client.embeddings(model=TEST_MODEL, prompt="Lorem ipsum dolor sit amet")
+        embedding1 = np.asarray(response1["embedding"], dtype=np.float32)
+        embedding2 = np.asarray(response2["embedding"], dtype=np.float32)
 
         # Calculate simple distance metric
-        distance = sum((a - b) ** 2 for a, b in zip(embedding1, embedding2, strict=False)) ** 0.5
+        distance = float(np.linalg.norm(embedding1 - embedding2))
 
         # Distance should be significant (not identical vectors)
         assert distance > 0.1, "Embeddings are too similar for different prompts"
 
-    def test_embeddings_similar_prompts(self, client: Client):
+    @pytest.mark.asyncio(scope="session")
+    async def test_embeddings_similar_prompts(self, embed_http: httpx.AsyncClient):
         """Test that similar prompts produce similar embeddings."""
-        prompt1 = "The weather is nice today"
-        prompt2 = "The weather is good today"
-        prompt3 = "Python is a programming language"
+        prompts = [
+            "The weather is nice today",
+            "The weather is good today",
+            "Python is a programming language",
+        ]
 
-        response1 = client.embeddings(model=TEST_MODEL, prompt=prompt1)
-        response2 = client.embeddings(model=TEST_MODEL, prompt=prompt2)
-        response3 = client.embeddings(model=TEST_MODEL, prompt=prompt3)
+        embs = np.asarray(await embed_batch(embed_http, prompts), dtype=np.float32)
 
-        # Calculate distances
-        def cosine_similarity(v1, v2):
-            dot_product = sum(a * b for a, b in zip(v1, v2, strict=False))
-            magnitude1 = sum(a**2 for a in v1) ** 0.5
-            magnitude2 = sum(b**2 for b in v2) ** 0.5
-            return dot_product / (magnitude1 * magnitude2)
+        # Normalize once, then get every pairwise cosine similarity from one matrix product
+        unit = embs / np.linalg.norm(embs, axis=1, keepdims=True)
+        sim = unit @ unit.T
 
         # Similar prompts should have higher similarity
-        sim_similar = cosine_similarity(response1["embedding"], response2["embedding"])
-        sim_different = cosine_similarity(response1["embedding"], response3["embedding"])
-
-        assert sim_similar > sim_different, "Similar prompts should have higher cosine similarity"
+        assert sim[0, 1] > sim[0, 2], "Similar prompts should have higher cosine similarity"
 
     def test_embeddings_empty_prompt_error(self, client: Client):
         """Test error handling for empty prompt."""
@@ -190,7 +160,8 @@ class TestOllamaSDKEmbeddingsIntegration:
         assert isinstance(response["embedding"], list)
         assert len(response["embedding"]) > 0
 
-    def test_embeddings_special_characters(self, client: Client):
+    @pytest.mark.asyncio(scope="session")
+    async def test_embeddings_special_characters(self, async_client: AsyncClient):
         """Test embeddings with various special characters."""
         special_prompts = [
             "Text with\ttabs\tand\tspaces",
@@ -200,13 +171,15 @@ class TestOllamaSDKEmbeddingsIntegration:
             "Text with <html>tags</html> and &entities;",
         ]
 
-        for prompt in special_prompts:
-            response = client.embeddings(model=TEST_MODEL, prompt=prompt)
+        responses = await asyncio.gather(
+            *[async_client.embeddings(model=TEST_MODEL, prompt=prompt) for prompt in special_prompts]
+        )
 
+        for response in responses:
             assert "embedding" in response
             assert isinstance(response["embedding"], list)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(scope="session")
     async def test_async_embeddings_basic(self, async_client: AsyncClient):
         """Test async embeddings functionality."""
         response = await async_client.embeddings(model=TEST_MODEL, prompt="Testing async embeddings")
@@ -215,11 +188,9 @@ class TestOllamaSDKEmbeddingsIntegration:
         assert isinstance(response["embedding"], list)
         assert len(response["embedding"]) > 0
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(scope="session")
     async def test_async_embeddings_concurrent(self, async_client: AsyncClient):
         """Test concurrent async embeddings requests."""
-        import asyncio
-
         prompts = [f"Prompt number {i}" for i in range(5)]
 
         # Create concurrent tasks
@@ -236,21 +207,23 @@ class TestOllamaSDKEmbeddingsIntegration:
 
     def test_embeddings_performance(self, client: Client):
         """Test embeddings generation performance."""
-        start_time = time.time()
-
-        # Generate embeddings
-        response = client.embeddings(model=TEST_MODEL, prompt="Performance test prompt")
+        # Warm up so connection setup is not counted in the timings
+        response = client.embeddings(model=TEST_MODEL, prompt="warmup")
+        assert "embedding" in response
 
-        elapsed_time = time.time() - start_time
+        timings = []
+        for _ in range(5):
+            t0 = time.perf_counter()
+            client.embeddings(model=TEST_MODEL, prompt="Performance test prompt")
+            timings.append(time.perf_counter() - t0)
 
-        # Verify response
-        assert "embedding" in response
+        median = sorted(timings)[len(timings) // 2]
 
         # Log performance
-        print(f"\nEmbeddings request completed in {elapsed_time:.2f} seconds")
+        print(f"\nEmbeddings request median over {len(timings)} runs: {median:.3f} seconds")
 
         # Basic sanity check - should complete within reasonable time
-        assert elapsed_time < 10, f"Request took too long: {elapsed_time} seconds"
+        assert median < 2.0, f"Request took too long: {median:.3f} seconds"
 
     def test_embeddings_model_validation(self, client: Client):
         """Test model validation for embeddings."""
@@ -267,11 +240,9 @@ class TestOllamaSDKEmbeddingsIntegration:
             # Expected to fail with invalid model
             assert "model" in str(e).lower() or "not found" in str(e).lower()
 
-    def test_embeddings_dimension_for_model(self, client: Client):
+    def test_embeddings_dimension_for_model(self, ollama_client: Client):
         """Test that embedding dimensions match expected size for the model."""
-        response = client.embeddings(model=TEST_MODEL, prompt="Test embedding dimensions")
-
-        embedding = response["embedding"]
+        embedding = ollama_client.embeddings(model=TEST_MODEL, prompt="Test embedding dimensions")["embedding"]
         dimension = len(embedding)
 
         # text-embedding-ada-002 should return 1536 dimensions
@@ -282,15 +253,13 @@ class TestOllamaSDKEmbeddingsIntegration:
         # Log the actual dimension for manual verification
         print(f"\nModel {TEST_MODEL} returned {dimension}-dimensional embeddings")
 
-    def test_embeddings_normalized_vectors(self, client: Client):
+    def test_embeddings_normalized_vectors(self, ollama_client: Client):
         """Test properties of embedding vectors."""
-        response = client.embeddings(model=TEST_MODEL, prompt="Test normalization")
-
-        embedding = response["embedding"]
+        embedding = ollama_client.embeddings(model=TEST_MODEL, prompt="Test normalization")["embedding"]
 
         # Check vector properties
         # Most embedding models return normalized vectors (magnitude ~1)
-        magnitude = sum(x**2 for x in embedding) ** 0.5
+        magnitude = float(np.linalg.norm(np.asarray(embedding, dtype=np.float32)))
 
         # Log magnitude for inspection
         print(f"\nEmbedding vector magnitude: {magnitude:.4f}")
@@ -298,15 +267,15 @@ class TestOllamaSDKEmbeddingsIntegration:
         # Verify reasonable range
         assert 0.1 < magnitude < 10, f"Unexpected vector magnitude: {magnitude}"
 
-    def test_both_endpoints_identical(self, client: Client):
+    def test_both_endpoints_identical(self, http: requests.Session, server_host: str):
         """Test that /api/embeddings and /api/embed return identical results."""
         prompt = "Test both endpoints"
 
         # Note: Ollama SDK only uses one endpoint, so we'll test via direct HTTP
 
         # Test /api/embeddings
-        response1 = requests.post(
-            f"{SERVER_HOST}/api/embeddings",
+        response1 = http.post(
+            f"{server_host}/api/embeddings",
             json={"model": TEST_MODEL, "prompt": prompt},
             headers={"Content-Type": "application/json"},
         )
@@ -314,8 +283,8 @@ class TestOllamaSDKEmbeddingsIntegration:
         data1 = response1.json()
 
         # Test /api/embed
-        response2 = requests.post(
-            f"{SERVER_HOST}/api/embed",
+        response2 = http.post(
+            f"{server_host}/api/embed",
             json={"model": TEST_MODEL, "prompt": prompt},
             headers={"Content-Type": "application/json"},
         )
@@ -324,17 +293,11 @@ class TestOllamaSDKEmbeddingsIntegration:
 
         # Verify responses are very similar (OpenAI may return slightly different values)
         # Calculate cosine similarity between embeddings
-        embedding1 = data1["embedding"]
-        embedding2 = data2["embedding"]
-
         # Ensure same dimensions
-        assert len(embedding1) == len(embedding2)
+        assert len(data1["embedding"]) == len(data2["embedding"])
 
         # Calculate cosine similarity
-        dot_product = sum(a * b for a, b in zip(embedding1, embedding2, strict=False))
-        magnitude1 = sum(a**2 for a in embedding1) ** 0.5
-        magnitude2 = sum(b**2 for b in embedding2) ** 0.5
-        cosine_similarity = dot_product / (magnitude1 * magnitude2)
+        cosine_similarity = _cosine(data1["embedding"], data2["embedding"])
 
         # Embeddings should be nearly identical (cosine similarity > 0.9999)
         assert cosine_similarity > 0.9999, f"Embeddings are not similar enough: {cosine_similarity}"
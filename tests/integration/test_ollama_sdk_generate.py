@@ -1,6 +1,9 @@
 """Integration tests for Ollama SDK generate() method compatibility."""
+import asyncio
+import io
 import json
 import time
+from datetime import datetime
 from typing import Any
 
 import pytest
@@ -15,10 +18,9 @@ class TestOllamaSDKGenerate:
     """Test Ollama SDK generate() method works with our proxy."""
 
     @pytest.fixture
-    def ollama_client(self) -> Any:
-        """Create Ollama client configured for our proxy."""
-        # Connect to the proxy server running on port 11434
-        return ollama.Client(host="http://localhost:11434")
+    def ollama_async_client(self, server_host: str) -> Any:
+        """Create async Ollama client configured for our proxy."""
+        return ollama.AsyncClient(host=server_host)
 
     def test_server_connectivity_generate(self, ollama_client: Any) -> None:
         """Test that we can connect to the proxy server for generate."""
@@ -55,9 +57,12 @@ class TestOllamaSDKGenerate:
         assert response.done is True
         assert len(response.response) > 0
 
-        # Verify timestamp format
-        created_at = response.created_at
-        assert created_at.endswith("Z") or "+" in created_at  # RFC3339 format
+        # Verify timestamp format (RFC3339: parseable, with a UTC "Z" or numeric offset)
+        try:
+            created_at = datetime.fromisoformat(response.created_at.replace("Z", "+00:00"))
+        except ValueError:
+            pytest.fail(f"created_at is not an RFC3339 timestamp: {response.created_at!r}")
+        assert created_at.tzinfo is not None, f"created_at has no UTC offset: {response.created_at!r}"
 
         print(f"Basic generate response: {response.response[:100]}...")
 
@@ -80,7 +85,8 @@ class TestOllamaSDKGenerate:
         assert len(response.response) > 0
         print(f"Generate with options response: {response.response}")
 
-    def test_generate_multiple_prompts(self, ollama_client: Any) -> None:
+    @pytest.mark.asyncio
+    async def test_generate_multiple_prompts(self, ollama_async_client: Any) -> None:
         """Test multiple prompt scenarios for consistency."""
         test_prompts = [
             "Say hello",
@@ -90,21 +96,27 @@ class TestOllamaSDKGenerate:
             "Explain REST API in 10 words",
         ]
 
-        for prompt in test_prompts:
-            response = ollama_client.generate(
-                model="gpt-3.5-turbo",
-                prompt=prompt,
-                stream=False,
-                options={"temperature": 0.1},  # Low temp for consistency
-            )
+        responses = await asyncio.gather(
+            *[
+                ollama_async_client.generate(
+                    model="gpt-3.5-turbo",
+                    prompt=prompt,
+                    stream=False,
+                    options={"temperature": 0.1},  # Low temp for consistency
+                )
+                for prompt in test_prompts
+            ]
+        )
 
+        for prompt, response in zip(test_prompts, responses, strict=True):
             # Verify each response
             assert response.done is True
             assert len(response.response) > 0
             assert response.model == "gpt-3.5-turbo"
             print(f"Prompt: '{prompt}' -> Response: {response.response[:50]}...")
 
-    def test_generate_different_models(self, ollama_client: Any) -> None:
+    @pytest.mark.asyncio
+    async def test_generate_different_models(self, ollama_async_client: Any) -> None:
         """Test generate() with different model names."""
         # Test with different OpenAI models available through our proxy
         test_models = [
@@ -112,21 +124,24 @@ class TestOllamaSDKGenerate:
             "gpt-4",  # Will work if API key has access
         ]
 
-        for model in test_models:
+        async def _one(model: str) -> Any:
             try:
-                response = ollama_client.generate(
-                    model=model,
-                    prompt="Say hello",
-                    stream=False,
-                )
-
-                # Model name should be preserved in response
-                assert response.model == model
-                assert response.done is True
-                print(f"Model {model} response: {response.response[:50]}...")
+                return await ollama_async_client.generate(model=model, prompt="Say hello", stream=False)
             except Exception as e:
+                return e
+
+        results = await asyncio.gather(*[_one(model) for model in test_models])
+
+        for model, result in zip(test_models, results, strict=True):
+            if isinstance(result, Exception):
                 # Some models might not be available with the API key
-                print(f"Model {model} not available: {e}")
+                print(f"Model {model} not available: {result}")
+                continue
+
+            # Model name should be preserved in response
+            assert result.model == model
+            assert result.done is True
+            print(f"Model {model} response: {result.response[:50]}...")
 
     def test_generate_error_handling(self, ollama_client: Any) -> None:
         """Test error handling for invalid requests."""
@@ -181,38 +196,34 @@ class TestOllamaSDKGenerate:
         print(f"Context test - First: {response1.response[:50]}...")
         print(f"Context test - Second: {response2.response}")
 
-    def test_generate_performance(self, ollama_client: Any) -> None:
-        """Benchmark generate() performance."""
-        # Time multiple requests
+    @pytest.mark.asyncio
+    async def test_generate_performance_concurrent(self, ollama_async_client: Any) -> None:
+        """Benchmark concurrent generate() throughput through the proxy."""
         num_requests = 5
         prompt = "Say 'ok'"  # Short prompt for quick responses
 
-        start_time = time.time()
-        response_times = []
-
-        for i in range(num_requests):
-            req_start = time.time()
-            response = ollama_client.generate(
+        async def timed_generate() -> float:
+            req_start = time.perf_counter()
+            response = await ollama_async_client.generate(
                 model="gpt-3.5-turbo",
                 prompt=prompt,
                 stream=False,
                 options={"temperature": 0.1},
             )
-            req_time = time.time() - req_start
-            response_times.append(req_time)
-
             assert response.done is True
-            print(f"Request {i+1}: {req_time:.3f}s")
+            return time.perf_counter() - req_start
 
-        elapsed_time = time.time() - start_time
-        avg_time = sum(response_times) / len(response_times)
+        start_time = time.perf_counter()
+        response_times = await asyncio.gather(*[timed_generate() for _ in range(num_requests)])
+        elapsed_time = time.perf_counter() - start_time
 
         # Log performance metrics
         print("\nPerformance metrics:")
-        print(f"Total time for {num_requests} requests: {elapsed_time:.3f}s")
-        print(f"Average time per request: {avg_time:.3f}s")
-        print(f"Min time: {min(response_times):.3f}s")
-        print(f"Max time: {max(response_times):.3f}s")
+        print(f"Wall-clock time for {num_requests} concurrent requests: {elapsed_time:.3f}s")
+        print(f"Throughput: {num_requests / elapsed_time:.2f} requests/s")
+        print(f"Average latency per request: {sum(response_times) / num_requests:.3f}s")
+        print(f"Min latency: {min(response_times):.3f}s")
+        print(f"Max latency: {max(response_times):.3f}s")
 
     def test_generate_format_json(self, ollama_client: Any) -> None:
         """Test generate() with JSON format."""
@@ -255,22 +266,27 @@ class TestOllamaSDKGenerate:
             stream=True,
         )
 
-        chunks = []
+        # Accumulate text as it arrives; only the count and last chunk are kept
+        buf = io.StringIO()
+        n_chunks = 0
+        last = None
         for chunk in stream:
-            chunks.append(chunk)
+            n_chunks += 1
+            last = chunk
             # With new SDK, chunks are also objects
             assert hasattr(chunk, "response")
             assert hasattr(chunk, "done")
+            if chunk.response:
+                buf.write(chunk.response)
 
         # Verify we got multiple chunks
-        assert len(chunks) > 1
+        assert n_chunks > 1
 
         # Last chunk should have done=True
-        assert chunks[-1].done is True
+        assert last.done is True
 
-        # Concatenate all responses
-        full_response = "".join(chunk.response for chunk in chunks if chunk.response)
-        print(f"Streaming response ({len(chunks)} chunks): {full_response}")
+        full_response = buf.getvalue()
+        print(f"Streaming response ({n_chunks} chunks): {full_response}")
 
     def test_generate_with_images_not_supported(self, ollama_client: Any) -> None:
         """Test that image generation is not supported through generate endpoint."""
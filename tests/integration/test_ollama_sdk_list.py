@@ -1,10 +1,12 @@
 """Integration tests for Ollama SDK against our proxy server."""
-import concurrent.futures
+import asyncio
+import inspect
 import os
 import time
 from datetime import datetime
 from typing import Any
 
+import httpx
 import pytest
 
 # Import ollama if available
@@ -16,13 +18,6 @@ ollama = pytest.importorskip("ollama", reason="ollama package required for SDK t
 class TestOllamaSDKIntegration:
     """Test Ollama SDK against our proxy server."""
 
-    @pytest.fixture
-    def ollama_client(self) -> Any:
-        """Create Ollama client pointing to proxy server."""
-        # Connect to the proxy server running on port 11434
-        client = ollama.Client(host="http://localhost:11434")
-        return client
-
     def test_server_connectivity(self, ollama_client: Any) -> None:
         """Test that we can connect to the proxy server."""
         try:
@@ -33,6 +28,12 @@ class TestOllamaSDKIntegration:
         except Exception as e:
             pytest.fail(f"Cannot connect to proxy server: {e}")
 
+    def test_proxy_still_serving_after_first_test(self, server_host: str) -> None:
+        """Test the session proxy keeps its state across tests (including PROXY_IN_PROCESS=1)."""
+        response = httpx.get(f"{server_host}/api/tags", timeout=30)
+
+        assert response.status_code == 200, response.text
+
     def test_list_models_real_server(self, ollama_client: Any) -> None:
         """Test model listing against our proxy server."""
         response = ollama_client.list()
@@ -72,37 +73,29 @@ class TestOllamaSDKIntegration:
     @pytest.mark.slow
     def test_performance_real_server(self, ollama_client: Any) -> None:
         """Test response time against our proxy server."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         response = ollama_client.list()
-        duration = time.time() - start_time
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
 
-        # Should complete within reasonable time (including OpenAI API call)
         assert duration < 10.0  # 10 seconds max for OpenAI API call
         assert hasattr(response, "models")
 
         print(f"Response time: {duration*1000:.2f}ms")
 
-    def test_concurrent_requests_real_server(self, ollama_client: Any) -> None:
+    @pytest.mark.asyncio(scope="session")
+    async def test_concurrent_requests_real_server(self, ollama_async_client: Any) -> None:
         """Test concurrent requests against our proxy server."""
-
-        def make_request() -> Any:
-            client = ollama.Client(host="http://localhost:11434")
-            return client.list()
-
-        # Make 5 concurrent requests (keep it reasonable for CI)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(make_request) for _ in range(5)]
-            results = []
-
-            for future in concurrent.futures.as_completed(futures, timeout=30):
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    pytest.fail(f"Concurrent request failed: {e}")
+        # Make 5 concurrent requests (keep it reasonable for CI), stopping at the first failure
+        tasks = [asyncio.create_task(ollama_async_client.list()) for _ in range(5)]
+        done, not_done = await asyncio.wait(tasks, timeout=30, return_when=asyncio.FIRST_EXCEPTION)
+        for task in not_done:
+            task.cancel()
+        # Let cancelled requests unwind here rather than during loop teardown
+        await asyncio.gather(*not_done, return_exceptions=True)
+        results = [task.result() for task in done]
 
         # All requests should succeed
-        assert len(results) == 5
+        assert len(done) == 5 and not not_done
         for result in results:
             assert hasattr(result, "models")
             assert isinstance(result.models, list)
@@ -122,29 +115,22 @@ class TestOllamaSDKCompatibility:
 
     def test_sdk_version_compatibility(self) -> None:
         """Test SDK version is compatible."""
-        import ollama
-
         # Check SDK has expected interface
         assert hasattr(ollama, "Client")
 
-        # Verify expected methods exist
-        client = ollama.Client()
-        assert hasattr(client, "list")
-        assert callable(client.list)
+        # Verify expected methods exist (on the class; no httpx client needed)
+        assert hasattr(ollama.Client, "list")
+        assert callable(ollama.Client.list)
 
     def test_client_instantiation(self) -> None:
-        """Test client can be created with different configurations."""
-        # Default client
-        client1 = ollama.Client()
-        assert client1 is not None
+        """Test client accepts the configurations we use, without building one."""
+        params = inspect.signature(ollama.Client.__init__).parameters
 
         # Client with specific host
-        client2 = ollama.Client(host="http://localhost:11434")
-        assert client2 is not None
+        assert "host" in params
 
-        # Client with timeout
-        client3 = ollama.Client(host="http://localhost:11434", timeout=30)
-        assert client3 is not None
+        # Client with timeout (forwarded to httpx through **kwargs)
+        assert "timeout" in params or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
 
 
 @pytest.mark.sdk
@@ -154,19 +140,16 @@ class TestOllamaSDKWithRealAPI:
 
     @pytest.fixture
     def real_api_key(self) -> Any:
-        """Get real API key from environment."""
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key or api_key == "test-key-12345":
-            pytest.skip("Real OpenAI API key required")
-        return api_key
+        """Get real API key from environment (collection skips this class without one)."""
+        return os.environ["OPENAI_API_KEY"]
 
-    def test_real_api_integration(self, real_api_key: str, monkeypatch: Any) -> None:
+    def test_real_api_integration(self, real_api_key: str, server_host: str, monkeypatch: Any) -> None:
         """Test integration with real OpenAI API."""
         # Set real API key
         monkeypatch.setenv("OPENAI_API_KEY", real_api_key)
 
         # Create client
-        client = ollama.Client(host="http://localhost:11434")
+        client = ollama.Client(host=server_host)
 
         # List models - should get OpenAI models via proxy
         response = client.list()
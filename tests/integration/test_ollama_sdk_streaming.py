@@ -1,4 +1,7 @@
 """Comprehensive integration tests for Ollama SDK streaming functionality."""
+import io
+import itertools
+import re
 import time
 from typing import Any
 
@@ -7,17 +10,35 @@ import pytest
 # Skip if ollama not installed
 ollama = pytest.importorskip("ollama", reason="ollama package required for SDK tests")
 
+# Content matchers, compiled once; plain alternations keep the original substring semantics
+_PIRATE_RE = re.compile(r"ahoy|matey|arr|ye|aye|sailin|treasure", re.IGNORECASE)
+_PARIS_RE = re.compile(r"paris", re.IGNORECASE)
+
+# Empty-ish prompts, one test case each so xdist can spread them across workers
+EDGE_CASES = [
+    ("", "empty prompt"),
+    (" ", "whitespace prompt"),
+    (".", "single punctuation"),
+    ("a", "single character"),
+]
+
+
+def _concat(chunks: Any) -> str:
+    """Concatenate the text of streamed chunks into one string."""
+    buf = io.StringIO()
+    append = buf.write
+    for c in chunks:
+        r = c.response
+        if r:
+            append(r)
+    return buf.getvalue()
+
 
 @pytest.mark.integration
 @pytest.mark.sdk
 class TestOllamaSDKStreaming:
     """Test Ollama SDK streaming generation with comprehensive validation."""
 
-    @pytest.fixture
-    def ollama_client(self) -> Any:
-        """Create Ollama client configured for our proxy."""
-        return ollama.Client(host="http://localhost:11434")
-
     def test_streaming_basic_validation(self, ollama_client: Any) -> None:
         """Test basic streaming with chunk validation."""
         stream = ollama_client.generate(
@@ -26,21 +47,13 @@ class TestOllamaSDKStreaming:
             stream=True,
         )
 
-        chunks = []
-        for chunk in stream:
-            chunks.append(chunk)
-
-            # Validate chunk structure (new SDK returns objects)
-            assert hasattr(chunk, "model")
-            assert hasattr(chunk, "created_at")
-            assert hasattr(chunk, "response")
-            assert hasattr(chunk, "done")
+        chunks = list(stream)
 
-            # Validate types
-            assert chunk.model == "gpt-3.5-turbo"
-            assert isinstance(chunk.created_at, str)
-            assert isinstance(chunk.response, str)
-            assert isinstance(chunk.done, bool)
+        # Validate chunk fields and types in bulk (new SDK returns objects)
+        assert all(c.model == "gpt-3.5-turbo" for c in chunks)
+        assert all(isinstance(c.created_at, str) for c in chunks)
+        assert all(isinstance(c.response, str) for c in chunks)
+        assert all(isinstance(c.done, bool) for c in chunks)
 
         # Validate we got multiple chunks
         assert len(chunks) > 1, "Should receive multiple chunks for streaming"
@@ -68,14 +81,15 @@ class TestOllamaSDKStreaming:
         assert chunks[-1].done is True, "Final chunk must have done=True"
 
         # Check if final chunk has other metadata
-        final_chunk = chunks[-1]
+        # Serialize once, then read fields with plain dict lookups
+        meta = chunks[-1].model_dump(exclude_none=True)
         print("\nFinal chunk metadata:")
-        print(f"  done: {final_chunk.done}")
-        print(f"  done_reason: {getattr(final_chunk, 'done_reason', 'N/A')}")
-        if hasattr(final_chunk, "eval_count"):
-            print(f"  eval_count: {final_chunk.eval_count}")
-        if hasattr(final_chunk, "eval_duration"):
-            print(f"  eval_duration: {final_chunk.eval_duration}")
+        print(f"  done: {meta['done']}")
+        print(f"  done_reason: {meta.get('done_reason', 'N/A')}")
+        if "eval_count" in meta:
+            print(f"  eval_count: {meta['eval_count']}")
+        if "eval_duration" in meta:
+            print(f"  eval_duration: {meta['eval_duration']}")
 
     def test_response_reconstruction(self, ollama_client: Any) -> None:
         """Test reconstructing full response from chunks."""
@@ -88,32 +102,37 @@ class TestOllamaSDKStreaming:
             stream=True,
         )
 
-        chunks = []
-        full_response = ""
+        # Single pass: collect text parts and timestamps, checking model consistency inline
+        parts = []
         timestamps = []
+        model = None
+        last_done = False
 
         for chunk in stream:
-            chunks.append(chunk)
             if chunk.response:
-                full_response += chunk.response
+                parts.append(chunk.response)
             timestamps.append(chunk.created_at)
+            model = model or chunk.model
+            assert chunk.model == model, "All chunks should have same model"
+            last_done = chunk.done
+
+        full_response = "".join(parts)
 
         print(f"\nReconstructed response: {full_response}")
-        print(f"Total chunks: {len(chunks)}")
+        print(f"Total chunks: {len(timestamps)}")
         print(f"Response length: {len(full_response)} chars")
 
         # Verify response makes sense
         assert len(full_response) > 0, "Should have non-empty response"
-        assert "Paris" in full_response or "paris" in full_response.lower(), "Response should mention Paris"
+        assert _PARIS_RE.search(full_response), "Response should mention Paris"
 
         # Check timestamp format consistency (timestamps may differ slightly)
         # Just verify all timestamps are in valid format
         for ts in timestamps:
             assert ts.endswith("Z") or "+" in ts, f"Invalid timestamp format: {ts}"
 
-        # Verify model consistency
-        models = [chunk.model for chunk in chunks]
-        assert all(m == "gpt-3.5-turbo" for m in models), "All chunks should have same model"
+        assert model == "gpt-3.5-turbo"
+        assert last_done is True
 
     def test_streaming_vs_non_streaming(self, ollama_client: Any) -> None:
         """Compare streaming vs non-streaming responses for same prompt."""
@@ -136,12 +155,9 @@ class TestOllamaSDKStreaming:
         )
 
         # Reconstruct streaming response
-        streaming_response = ""
-        chunk_count = 0
-        for chunk in stream:
-            if chunk.response:
-                streaming_response += chunk.response
-            chunk_count += 1
+        chunks = list(stream)
+        chunk_count = len(chunks)
+        streaming_response = _concat(chunks)
 
         print(f"\nNon-streaming response: {non_stream_response.response[:100]}...")
         print(f"Streaming response ({chunk_count} chunks): {streaming_response[:100]}...")
@@ -162,7 +178,7 @@ class TestOllamaSDKStreaming:
         )
 
         chunks = list(stream)
-        full_response = "".join(chunk.response for chunk in chunks if chunk.response)
+        full_response = _concat(chunks)
 
         print(f"\nShort response: '{full_response}'")
         print(f"Chunk count: {len(chunks)}")
@@ -179,27 +195,38 @@ class TestOllamaSDKStreaming:
             stream=True,
         )
 
-        chunks = []
-        chunk_sizes = []
-        start_time = time.time()
+        # Running statistics only; no chunk objects are retained
+        n = 0
+        n_content = 0
+        size_sum = 0
+        size_min = float("inf")
+        size_max = 0
+        last = None
+        start_ns = time.perf_counter_ns()
 
         for chunk in stream:
-            chunks.append(chunk)
+            n += 1
+            last = chunk
             if chunk.response:
-                chunk_sizes.append(len(chunk.response))
+                size = len(chunk.response)
+                n_content += 1
+                size_sum += size
+                size_min = min(size_min, size)
+                size_max = max(size_max, size)
 
-        elapsed = time.time() - start_time
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
 
         print("\nLong response streaming stats:")
-        print(f"  Total chunks: {len(chunks)}")
-        print(f"  Chunks with content: {len(chunk_sizes)}")
-        print(f"  Average chunk size: {sum(chunk_sizes) / len(chunk_sizes):.1f} chars")
-        print(f"  Min chunk size: {min(chunk_sizes)} chars")
-        print(f"  Max chunk size: {max(chunk_sizes)} chars")
+        print(f"  Total chunks: {n}")
+        print(f"  Chunks with content: {n_content}")
+        print(f"  Average chunk size: {size_sum / n_content:.1f} chars")
+        print(f"  Min chunk size: {size_min} chars")
+        print(f"  Max chunk size: {size_max} chars")
         print(f"  Streaming duration: {elapsed:.2f}s")
 
         # Should have many chunks for detailed response
-        assert len(chunks) > 5, "Detailed response should have multiple chunks"
+        assert n > 5, "Detailed response should have multiple chunks"
+        assert last.done is True
 
     def test_streaming_with_system_prompt(self, ollama_client: Any) -> None:
         """Test streaming with system prompt."""
@@ -210,19 +237,14 @@ class TestOllamaSDKStreaming:
             stream=True,
         )
 
-        full_response = ""
-        chunk_count = 0
-
-        for chunk in stream:
-            if chunk.response:
-                full_response += chunk.response
-            chunk_count += 1
+        chunks = list(stream)
+        chunk_count = len(chunks)
+        full_response = _concat(chunks)
 
         print(f"\nPirate response ({chunk_count} chunks): {full_response}")
 
         # Should have pirate-like language
-        pirate_words = ["ahoy", "matey", "arr", "ye", "aye", "sailin", "treasure"]
-        assert any(word in full_response.lower() for word in pirate_words), "Should contain pirate speak"
+        assert _PIRATE_RE.search(full_response), "Should contain pirate speak"
 
     def test_streaming_with_options(self, ollama_client: Any) -> None:
         """Test streaming with various options."""
@@ -238,7 +260,7 @@ class TestOllamaSDKStreaming:
         )
 
         chunks = list(stream)
-        full_response = "".join(chunk.response for chunk in chunks if chunk.response)
+        full_response = _concat(chunks)
 
         print(f"\nOptions test response: '{full_response}'")
         print(f"Word count: {len(full_response.split())}")
@@ -267,10 +289,7 @@ class TestOllamaSDKStreaming:
                 stream=True,
             )
 
-            response2 = ""
-            for chunk in stream2:
-                if chunk.response:
-                    response2 += chunk.response
+            response2 = _concat(stream2)
 
             print("\nContext preservation test:")
             print("  Context available: Yes")
@@ -282,10 +301,9 @@ class TestOllamaSDKStreaming:
         """Measure streaming performance and chunk delivery timing."""
         prompt = "Tell me a fun fact"
 
-        # Measure chunk arrival times
-        chunk_times = []
-        start_time = time.time()
-        first_chunk_time = None
+        # Measure chunk arrival times as raw monotonic ns, converted to seconds once at the end
+        arrivals_ns = []
+        start_ns = time.perf_counter_ns()
 
         stream = ollama_client.generate(
             model="gpt-3.5-turbo",
@@ -293,20 +311,15 @@ class TestOllamaSDKStreaming:
             stream=True,
         )
 
-        for i, _ in enumerate(stream):
-            arrival_time = time.time() - start_time
-            chunk_times.append(arrival_time)
-
-            if i == 0:
-                first_chunk_time = arrival_time
+        for _ in stream:
+            arrivals_ns.append(time.perf_counter_ns())
 
+        chunk_times = [(t - start_ns) / 1e9 for t in arrivals_ns]
+        first_chunk_time = chunk_times[0]
         total_time = chunk_times[-1]
 
         # Calculate inter-chunk delays
-        inter_chunk_delays = []
-        for i in range(1, len(chunk_times)):
-            delay = chunk_times[i] - chunk_times[i - 1]
-            inter_chunk_delays.append(delay)
+        inter_chunk_delays = [(b - a) / 1e9 for a, b in itertools.pairwise(arrivals_ns)]
 
         print("\nStreaming performance metrics:")
         print(f"  Time to first chunk: {first_chunk_time:.3f}s")
@@ -316,7 +329,7 @@ class TestOllamaSDKStreaming:
         print(f"  Max inter-chunk delay: {max(inter_chunk_delays):.3f}s")
 
         # Performance assertions
-        assert first_chunk_time is not None and first_chunk_time < 2.0, "First chunk should arrive within 2 seconds"
+        assert first_chunk_time < 2.0, "First chunk should arrive within 2 seconds"
         assert total_time < 10.0, "Total streaming should complete within 10 seconds"
 
     def test_streaming_interruption_handling(self, ollama_client: Any) -> None:
@@ -344,35 +357,28 @@ class TestOllamaSDKStreaming:
         # Should have collected some chunks
         assert len(chunks_before_break) >= 5
 
-    def test_streaming_edge_cases(self, ollama_client: Any) -> None:
+    @pytest.mark.parametrize("prompt,description", EDGE_CASES)
+    def test_streaming_edge_cases(self, ollama_client: Any, prompt: str, description: str) -> None:
         """Test various edge cases in streaming."""
-        # Test with empty-ish prompts
-        edge_cases = [
-            ("", "empty prompt"),
-            (" ", "whitespace prompt"),
-            (".", "single punctuation"),
-            ("a", "single character"),
-        ]
-
-        for prompt, description in edge_cases:
-            try:
-                stream = ollama_client.generate(
-                    model="gpt-3.5-turbo",
-                    prompt=prompt,
-                    stream=True,
-                )
-
-                chunks = list(stream)
-                response = "".join(chunk.response for chunk in chunks if chunk.response)
-
-                print(f"\nEdge case - {description}:")
-                print(f"  Prompt: '{prompt}'")
-                print(f"  Chunks: {len(chunks)}")
-                print(f"  Response length: {len(response)}")
-
-                # Should still get valid response structure
-                assert len(chunks) > 0
-                assert chunks[-1].done is True
-
-            except Exception as e:
-                print(f"\nEdge case - {description}: Error: {e}")
+        try:
+            stream = ollama_client.generate(
+                model="gpt-3.5-turbo",
+                prompt=prompt,
+                stream=True,
+            )
+
+            chunks = list(stream)
+            response = _concat(chunks)
+        except Exception as e:
+            # The proxy rejects an empty prompt; other errors are reported, not failed on
+            print(f"\nEdge case - {description}: Error: {e}")
+            return
+
+        print(f"\nEdge case - {description}:")
+        print(f"  Prompt: '{prompt}'")
+        print(f"  Chunks: {len(chunks)}")
+        print(f"  Response length: {len(response)}")
+
+        # Should still get valid response structure
+        assert len(chunks) > 0
+        assert chunks[-1].done is True
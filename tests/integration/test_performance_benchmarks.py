@@ -1,52 +1,88 @@
 """Integration performance benchmarks for our proxy server."""
+import asyncio
+import math
 import statistics
 import time
-from typing import Callable, List
+import warnings
+from time import perf_counter as _now
+from typing import Any, Callable, List
 
+import httpx
+import numpy as np
 import pytest
 
 ollama = pytest.importorskip("ollama")
 
 
+def _calibrate_n(func: Callable, resolution: float, target_ratio: int = 25) -> int:
+    """Return how many calls of ``func`` span ``target_ratio`` clock ticks."""
+    start = _now()
+    func()
+    t_hat = _now() - start
+    if t_hat <= 0:
+        return target_ratio
+    return max(1, math.ceil(target_ratio * resolution / t_hat))
+
+
+def _warmup_once(client: Any) -> None:
+    """Open the pooled connection with one call, skipping the test if the proxy is unreachable."""
+    try:
+        client.list()
+    except Exception as e:
+        pytest.skip(f"Cannot connect to proxy server: {e}")
+
+
 @pytest.mark.sdk
 @pytest.mark.slow
 @pytest.mark.integration
 class TestProxyServerPerformance:
     """Performance benchmarks against our proxy server."""
 
-    def measure_response_time(self, func: Callable, iterations: int = 10) -> List[float]:
-        """Measure response time over multiple iterations."""
-        times = []
-        for _ in range(iterations):
-            start = time.time()
-            func()
-            times.append(time.time() - start)
+    def measure_response_time(self, func: Callable, iterations: int = 10, n: int = 1) -> Any:
+        """Measure per-call response time over multiple iterations of ``n`` calls each, as a numpy array."""
+        # Preallocated so the timing loop never grows a list, and the stats below work on it without a copy
+        times = np.empty(iterations)
+        for i in range(iterations):
+            start = _now()
+            for _ in range(n):
+                func()
+            times[i] = (_now() - start) / n
         return times
 
-    def test_proxy_server_performance_benchmark(self) -> None:
+    def _overhead(self) -> float:
+        """Median cost of the measurement harness itself, timed around a no-op."""
+        return float(np.median(self.measure_response_time(lambda: None, 1000)))
+
+    def test_proxy_server_performance_benchmark(self, ollama_client: Any) -> None:
         """Benchmark model listing performance against our proxy server."""
-        client = ollama.Client(host="http://localhost:11434")
+        client = ollama_client
 
-        # Warmup (fewer iterations for real server)
-        for _ in range(3):
-            try:
-                client.list()
-            except Exception:
-                pytest.skip("Cannot connect to proxy server")
+        _warmup_once(client)
 
-        # Measure performance (fewer iterations for CI)
-        times = self.measure_response_time(lambda: client.list(), iterations=10)
+        # Measure performance (fewer iterations for CI); calls faster than the
+        # clock resolution are batched so each sample spans many ticks
+        resolution = time.get_clock_info("perf_counter").resolution
+        n = _calibrate_n(client.list, resolution)
+        raw_times = self.measure_response_time(client.list, iterations=10, n=n)
+
+        # Remove harness cost so the numbers reflect the request alone
+        ovh = self._overhead()
+        if ovh / np.median(raw_times) > 0.10:
+            warnings.warn("benchmark overhead >10%", stacklevel=2)
+        arr = np.maximum(raw_times - ovh, 0.0)
 
         # Calculate statistics
-        avg_time = statistics.mean(times)
-        median_time = statistics.median(times)
-        max_time = max(times)
-        min_time = min(times)
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        avg_time = arr.mean()
+        max_time = arr.max()
+        min_time = arr.min()
 
         # Log results
-        print("\nProxy Server Performance:")
+        print(f"\nProxy Server Performance (n={n} calls per sample):")
         print(f"  Average: {avg_time*1000:.2f}ms")
-        print(f"  Median: {median_time*1000:.2f}ms")
+        print(f"  Median: {p50*1000:.2f}ms")
+        print(f"  p95: {p95*1000:.2f}ms")
+        print(f"  p99: {p99*1000:.2f}ms")
         print(f"  Min: {min_time*1000:.2f}ms")
         print(f"  Max: {max_time*1000:.2f}ms")
 
@@ -54,46 +90,49 @@ class TestProxyServerPerformance:
         assert avg_time < 5.0  # Average under 5 seconds (includes OpenAI API call)
         assert max_time < 15.0  # No request over 15 seconds
 
-    def test_proxy_server_response_time(self) -> None:
+    def test_proxy_server_response_time(self, ollama_client: Any) -> None:
         """Test basic response time against our proxy server."""
-        client = ollama.Client(host="http://localhost:11434")
+        client = ollama_client
 
-        start_time = time.time()
-        try:
-            response = client.list()
-            duration = time.time() - start_time
+        _warmup_once(client)
 
-            # Should complete within reasonable time (including OpenAI API call)
-            assert duration < 10.0  # 10 seconds max for OpenAI API call
-            assert isinstance(response, dict)
+        start_time = _now()
+        response = client.list()
+        duration = _now() - start_time
 
-            print(f"Single request time: {duration*1000:.2f}ms")
+        # Should complete within reasonable time (including OpenAI API call)
+        assert duration < 10.0  # 10 seconds max for OpenAI API call
+        assert hasattr(response, "models")
 
-        except Exception as e:
-            pytest.skip(f"Cannot test performance - proxy server not available: {e}")
+        print(f"Single request time: {duration*1000:.2f}ms")
 
-    def test_proxy_server_load_handling(self) -> None:
-        """Test how our proxy server handles multiple sequential requests."""
-        client = ollama.Client(host="http://localhost:11434")
+    def test_proxy_server_load_handling(self, server_host: str) -> None:
+        """Test how our proxy server handles multiple concurrent requests."""
 
-        response_times = []
-        errors = 0
+        async def _timed(c: httpx.AsyncClient) -> float:
+            start = _now()
+            response = await c.get("/api/tags")
+            response.raise_for_status()
+            # Verify response is valid Ollama format
+            assert isinstance(response.json()["models"], list)
+            return _now() - start
 
-        # Make 20 sequential requests
-        for i in range(20):
-            start = time.time()
-            try:
-                response = client.list()
-                duration = time.time() - start
-                response_times.append(duration)
+        async def _load(n: int) -> List[Any]:
+            limits = httpx.Limits(max_keepalive_connections=20)
+            async with httpx.AsyncClient(base_url=server_host, limits=limits, timeout=30) as c:
+                return await asyncio.gather(*[_timed(c) for _ in range(n)], return_exceptions=True)
 
-                # Verify response is valid (ollama 0.5+ format)
-                assert hasattr(response, "models")
-                assert isinstance(response.models, list)
+        # Make 20 concurrent requests over one pooled client
+        results = asyncio.run(_load(20))
 
-            except Exception as e:
+        response_times = []
+        errors = 0
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
                 errors += 1
-                print(f"Request {i+1} failed: {e}")
+                print(f"Request {i+1} failed: {result}")
+            else:
+                response_times.append(result)
 
         if not response_times:
             pytest.skip("No successful requests - server not available")
@@ -118,9 +157,9 @@ class TestProxyServerPerformance:
 class TestProxyServerEdgeCases:
     """Test edge cases against our proxy server."""
 
-    def test_proxy_server_availability(self) -> None:
+    def test_proxy_server_availability(self, ollama_client: Any) -> None:
         """Test our proxy server availability and basic functionality."""
-        client = ollama.Client(host="http://localhost:11434")
+        client = ollama_client
 
         try:
             response = client.list()
@@ -131,24 +170,27 @@ class TestProxyServerEdgeCases:
         except Exception as e:
             pytest.fail(f"Proxy server not available: {e}")
 
-    def test_multiple_proxy_clients(self) -> None:
-        """Test multiple client instances against our proxy server."""
-        clients = [ollama.Client(host="http://localhost:11434") for _ in range(3)]
+    def test_multiple_proxy_clients(self, server_host: str) -> None:
+        """Test several simultaneous clients against our proxy server."""
 
-        responses = []
-        for i, client in enumerate(clients):
-            try:
-                response = client.list()
-                responses.append(response)
-                print(f"Client {i+1}: {len(response.models)} models from proxy")
-            except Exception as e:
-                pytest.fail(f"Client {i+1} failed to connect to proxy: {e}")
+        async def _multi() -> List[httpx.Response]:
+            # One pooled client with a connection per concurrent caller
+            limits = httpx.Limits(max_keepalive_connections=3)
+            async with httpx.AsyncClient(base_url=server_host, limits=limits, timeout=30) as c:
+                return await asyncio.gather(*[c.get("/api/tags") for _ in range(3)])
+
+        try:
+            responses = asyncio.run(_multi())
+        except httpx.HTTPError as e:
+            pytest.fail(f"Client failed to connect to proxy: {e}")
 
         # All clients should get responses
         assert len(responses) == 3
-        for response in responses:
-            assert hasattr(response, "models")
-            assert isinstance(response.models, list)
+        for i, response in enumerate(responses):
+            assert response.status_code == 200
+            data = response.json()
+            assert isinstance(data["models"], list)
+            print(f"Client {i+1}: {len(data['models'])} models from proxy")
 
 
 def test_ollama_cli_compatibility() -> None:
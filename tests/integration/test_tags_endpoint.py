@@ -1,19 +1,28 @@
 """Integration tests for /api/tags endpoint."""
+import asyncio
+import statistics
+from time import perf_counter
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from ollama_openai_proxy.config import Settings
 from ollama_openai_proxy.main import app
+from ollama_openai_proxy.routes.tags import TagsCache
 from ollama_openai_proxy.services.openai_service import OpenAIService
 
 
 @pytest.fixture
 def client(monkeypatch):
-    """Create test client with mocked dependencies."""
-    # Mock environment
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
-
+    """Create test client with mocked dependencies.
+
+    The app lifespan is not entered: it would build real settings and an
+    OpenAI client on every test only for them to be replaced by mocks, and
+    would replace the state of an in-process session proxy serving the same
+    app. Every app.state attribute set here is restored by monkeypatch. The
+    /api/tags cache is left off; cache tests install their own.
+    """
     # Create mock settings and service
     mock_settings = MagicMock(spec=Settings)
     mock_settings.openai_api_key = "test-key"
@@ -24,16 +33,16 @@ def client(monkeypatch):
 
     mock_openai_service = MagicMock(spec=OpenAIService)
 
-    # Set up app state
-    with TestClient(app) as client:
-        client.app.state.settings = mock_settings
-        client.app.state.openai_service = mock_openai_service
-        yield client
+    # Set up app state, undone after the test
+    monkeypatch.setattr(app.state, "settings", mock_settings, raising=False)
+    monkeypatch.setattr(app.state, "openai_service", mock_openai_service, raising=False)
+    monkeypatch.setattr(app.state, "tags_cache", None, raising=False)
+    return TestClient(app)
 
 
-@pytest.fixture
-def mock_openai_models():
-    """Mock OpenAI models response."""
+@pytest.fixture(scope="module")
+def tags_openai_models():
+    """Mock OpenAI models response, built once per module (tests only read it)."""
     from openai.types import Model
 
     return [
@@ -42,13 +51,27 @@ def mock_openai_models():
     ]
 
 
+@pytest.fixture(scope="module")
+def large_model_list():
+    """A thousand translatable OpenAI models, built once per module."""
+    from openai.types import Model
+
+    return [Model(id=f"gpt-4-{i:04d}", created=1680000000 + i, object="model", owned_by="openai") for i in range(1000)]
+
+
+def patch_list_models(monkeypatch, client, **mock_kwargs):
+    """Replace the service's list_models with an AsyncMock, restored on teardown."""
+    service = client.app.state.openai_service
+    monkeypatch.setattr(service, "list_models", AsyncMock(**mock_kwargs))
+
+
 class TestTagsEndpoint:
     """Test /api/tags endpoint."""
 
-    def test_list_models_success(self, client, mock_openai_models):
+    def test_list_models_success(self, client, monkeypatch, tags_openai_models):
         """Test successful model listing."""
         # Mock the list_models method
-        client.app.state.openai_service.list_models = AsyncMock(return_value=mock_openai_models)
+        patch_list_models(monkeypatch, client, return_value=tags_openai_models)
 
         response = client.get("/api/tags")
 
@@ -64,9 +87,9 @@ class TestTagsEndpoint:
         assert "Cache-Control" in response.headers
         assert response.headers["X-Model-Count"] == "2"
 
-    def test_list_models_empty(self, client):
+    def test_list_models_empty(self, client, monkeypatch):
         """Test empty model list."""
-        client.app.state.openai_service.list_models = AsyncMock(return_value=[])
+        patch_list_models(monkeypatch, client, return_value=[])
 
         response = client.get("/api/tags")
 
@@ -74,9 +97,9 @@ class TestTagsEndpoint:
         data = response.json()
         assert data["models"] == []
 
-    def test_list_models_error(self, client):
+    def test_list_models_error(self, client, monkeypatch):
         """Test error handling."""
-        client.app.state.openai_service.list_models = AsyncMock(side_effect=Exception("API Error"))
+        patch_list_models(monkeypatch, client, side_effect=Exception("API Error"))
 
         response = client.get("/api/tags")
 
@@ -85,9 +108,9 @@ class TestTagsEndpoint:
         assert "error" in data["detail"]
         assert "Failed to fetch models" in data["detail"]["error"]
 
-    def test_response_format(self, client, mock_openai_models):
+    def test_response_format(self, client, monkeypatch, tags_openai_models):
         """Test response matches Ollama format exactly."""
-        client.app.state.openai_service.list_models = AsyncMock(return_value=mock_openai_models)
+        patch_list_models(monkeypatch, client, return_value=tags_openai_models)
 
         response = client.get("/api/tags")
         data = response.json()
@@ -104,3 +127,110 @@ class TestTagsEndpoint:
             assert "size" in model
             assert isinstance(model["size"], int)
             assert model["modified_at"].endswith("Z")  # ISO format with Z
+
+    def test_list_models_large(self, client, monkeypatch, large_model_list):
+        """Test a very large upstream model list is translated in full."""
+        patch_list_models(monkeypatch, client, return_value=large_model_list)
+
+        response = client.get("/api/tags")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["models"]) == 1000
+        assert response.headers["X-Model-Count"] == "1000"
+        assert data["models"][0]["name"] == "gpt-4-0000"
+
+    def test_list_models_in_process_latency(self, client, monkeypatch, tags_openai_models):
+        """Test /api/tags handling cost in-process, with no socket between client and app."""
+        patch_list_models(monkeypatch, client, return_value=tags_openai_models)
+        client.get("/api/tags")  # warm up routing and the translation path
+
+        times = []
+        for _ in range(50):
+            start = perf_counter()
+            response = client.get("/api/tags")
+            times.append(perf_counter() - start)
+            assert response.status_code == 200
+
+        assert statistics.median(times) < 0.05  # Proxy overhead alone, no network or upstream
+
+    def test_cache_hit_latency(self, client, monkeypatch, tags_openai_models):
+        """Test repeat requests within the TTL are served from cache, not upstream."""
+
+        async def upstream_list_models():
+            await asyncio.sleep(0.05)  # Stand-in for an OpenAI round trip
+            return tags_openai_models
+
+        patch_list_models(monkeypatch, client, side_effect=upstream_list_models)
+        monkeypatch.setattr(client.app.state, "tags_cache", TagsCache(), raising=False)
+
+        start = perf_counter()
+        response = client.get("/api/tags")
+        first_call_time = perf_counter() - start
+        assert response.headers["X-Cache"] == "MISS"
+
+        times = []
+        for _ in range(19):
+            start = perf_counter()
+            response = client.get("/api/tags")
+            times.append(perf_counter() - start)
+            assert response.headers.get("X-Cache") == "HIT"
+
+        assert response.json()["models"][0]["name"] == "gpt-3.5-turbo"
+        assert client.app.state.openai_service.list_models.call_count == 1
+        assert statistics.median(times) < first_call_time * 0.1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_coalesced(self, client, monkeypatch, tags_openai_models):
+        """Test concurrent cold requests share a single upstream call."""
+
+        async def slow_list_models():
+            await asyncio.sleep(0.05)
+            return tags_openai_models
+
+        patch_list_models(monkeypatch, client, side_effect=slow_list_models)
+        monkeypatch.setattr(client.app.state, "tags_cache", TagsCache(), raising=False)
+
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            responses = await asyncio.gather(*[async_client.get("/api/tags") for _ in range(5)])
+
+        assert all(r.status_code == 200 for r in responses)
+        assert client.app.state.openai_service.list_models.call_count == 1
+
+    def test_cache_expires_after_ttl(self, client, monkeypatch, tags_openai_models):
+        """Test a cached model list is refetched once its TTL has passed."""
+        patch_list_models(monkeypatch, client, return_value=tags_openai_models)
+        now = [0.0]
+        monkeypatch.setattr(client.app.state, "tags_cache", TagsCache(ttl=10.0, clock=lambda: now[0]), raising=False)
+
+        assert client.get("/api/tags").headers["X-Cache"] == "MISS"
+        now[0] = 9.9
+        assert client.get("/api/tags").headers["X-Cache"] == "HIT"
+        now[0] = 10.0
+        assert client.get("/api/tags").headers["X-Cache"] == "MISS"
+
+        assert client.app.state.openai_service.list_models.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_upstream_error_not_cached(self, client, monkeypatch, tags_openai_models):
+        """Test an upstream failure reaches every concurrent caller and is not cached."""
+
+        async def failing_list_models():
+            await asyncio.sleep(0.01)
+            raise Exception("API Error")
+
+        patch_list_models(monkeypatch, client, side_effect=failing_list_models)
+        monkeypatch.setattr(client.app.state, "tags_cache", TagsCache(), raising=False)
+
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            responses = await asyncio.gather(*[async_client.get("/api/tags") for _ in range(5)])
+            assert all(r.status_code == 500 for r in responses)
+
+            # Once upstream recovers, the next request fetches afresh and fills the cache
+            patch_list_models(monkeypatch, client, return_value=tags_openai_models)
+            response = await async_client.get("/api/tags")
+            assert response.status_code == 200
+            assert response.headers["X-Cache"] == "MISS"
+            assert (await async_client.get("/api/tags")).headers["X-Cache"] == "HIT"
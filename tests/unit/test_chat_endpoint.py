@@ -1,15 +1,26 @@
 """Unit tests for the chat endpoint."""
-import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
+import orjson
 import pytest
+import pytest_asyncio
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from ollama_openai_proxy.routes import chat
-from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
 from openai.types.chat.chat_completion import Choice
 from openai.types.chat.chat_completion_chunk import ChoiceDelta
 
+# Prebuilt streaming chunks; the route only reads choices[0].delta and finish_reason
+STREAM_CHUNKS = [
+    SimpleNamespace(
+        choices=[SimpleNamespace(delta=ChoiceDelta(content=content or None), finish_reason=finish_reason)],
+        model="gpt-3.5-turbo",
+    )
+    for content, finish_reason in [("Hello", None), (" there", None), ("!", None), ("", "stop")]
+]
+
 
 @pytest.fixture
 def app():
@@ -24,10 +35,11 @@ def app():
     return app
 
 
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return TestClient(app)
+@pytest_asyncio.fixture
+async def client(app):
+    """Create async test client that calls the ASGI app in-process."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
 
 
 @pytest.fixture
@@ -63,7 +75,7 @@ class TestChatEndpoint:
         # Make request
         request_data = {"model": "llama2", "messages": [{"role": "user", "content": "Hello!"}], "stream": False}
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         # Verify response
         assert response.status_code == 200
@@ -103,7 +115,7 @@ class TestChatEndpoint:
             "stream": False,
         }
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         # Verify response
         assert response.status_code == 200
@@ -143,7 +155,7 @@ class TestChatEndpoint:
             "stream": False,
         }
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         # Verify response
         assert response.status_code == 200
@@ -178,7 +190,7 @@ class TestChatEndpoint:
             "options": {"temperature": 0.5, "top_p": 0.9, "max_tokens": 100},
         }
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         # Verify response
         assert response.status_code == 200
@@ -194,7 +206,7 @@ class TestChatEndpoint:
         """Test error when messages array is empty."""
         request_data = {"model": "llama2", "messages": [], "stream": False}
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         assert response.status_code == 400
         data = response.json()
@@ -206,7 +218,7 @@ class TestChatEndpoint:
         """Test error when message has invalid role."""
         request_data = {"model": "llama2", "messages": [{"role": "invalid_role", "content": "Hello!"}], "stream": False}
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         assert response.status_code == 400
         data = response.json()
@@ -219,12 +231,7 @@ class TestChatEndpoint:
 
         # Create async generator for streaming
         async def mock_stream():
-            chunks = ["Hello", " there", "!", ""]
-            for i, content in enumerate(chunks):
-                chunk = MagicMock(spec=ChatCompletionChunk)
-                chunk.choices = [MagicMock()]
-                chunk.choices[0].delta = ChoiceDelta(content=content if content else None)
-                chunk.choices[0].finish_reason = "stop" if i == len(chunks) - 1 else None
+            for chunk in STREAM_CHUNKS:
                 yield chunk
 
         mock_openai_service.create_chat_completion_stream = MagicMock(return_value=mock_stream())
@@ -232,15 +239,19 @@ class TestChatEndpoint:
         # Make streaming request
         request_data = {"model": "llama2", "messages": [{"role": "user", "content": "Hello!"}], "stream": True}
 
-        with client.stream("POST", "/api/chat", json=request_data) as response:
+        async with client.stream("POST", "/api/chat", json=request_data) as response:
             assert response.status_code == 200
             assert response.headers["content-type"] == "application/x-ndjson"
 
-            # Collect all chunks
+            # Collect all chunks, splitting NDJSON on the raw bytes
             chunks = []
-            for line in response.iter_lines():
-                if line:
-                    chunks.append(json.loads(line))
+            buf = b""
+            async for part in response.aiter_bytes():
+                buf += part
+                while (nl := buf.find(b"\n")) >= 0:
+                    if nl:
+                        chunks.append(orjson.loads(buf[:nl]))
+                    buf = buf[nl + 1 :]
 
             # Verify chunks
             assert len(chunks) >= 3  # At least some content chunks
@@ -251,42 +262,44 @@ class TestChatEndpoint:
             assert full_content == "Hello there!"
 
     @pytest.mark.asyncio
-    async def test_chat_model_not_found_error(self, client, mock_openai_service):
+    async def test_chat_model_not_found_error(self, client, mock_openai_service, make_openai_error):
         """Test model not found error handling."""
         from openai import NotFoundError
 
         mock_openai_service.create_chat_completion = AsyncMock(
-            side_effect=NotFoundError(
-                message="Model not found",
-                response=MagicMock(status_code=404),
-                body={"error": {"message": "Model 'invalid-model' not found"}},
+            side_effect=make_openai_error(
+                NotFoundError,
+                404,
+                "Model not found",
+                {"error": {"message": "Model 'invalid-model' not found"}},
             )
         )
 
         request_data = {"model": "invalid-model", "messages": [{"role": "user", "content": "Hello!"}], "stream": False}
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         assert response.status_code == 404
         data = response.json()
         assert "error" in data
 
     @pytest.mark.asyncio
-    async def test_chat_rate_limit_error(self, client, mock_openai_service):
+    async def test_chat_rate_limit_error(self, client, mock_openai_service, make_openai_error):
         """Test rate limit error handling."""
         from openai import RateLimitError
 
         mock_openai_service.create_chat_completion = AsyncMock(
-            side_effect=RateLimitError(
-                message="Rate limit exceeded",
-                response=MagicMock(status_code=429),
-                body={"error": {"message": "Rate limit exceeded"}},
+            side_effect=make_openai_error(
+                RateLimitError,
+                429,
+                "Rate limit exceeded",
+                {"error": {"message": "Rate limit exceeded"}},
             )
         )
 
         request_data = {"model": "llama2", "messages": [{"role": "user", "content": "Hello!"}], "stream": False}
 
-        response = client.post("/api/chat", json=request_data)
+        response = await client.post("/api/chat", json=request_data)
 
         assert response.status_code == 429
         data = response.json()
@@ -108,58 +108,26 @@ class TestEmbeddingsEndpoint:
         assert "Prompt cannot be empty" in data["error"]
 
     @pytest.mark.asyncio
-    async def test_embeddings_model_not_found(self, client, mock_openai_service):
-        """Test handling of model not found error."""
+    @pytest.mark.parametrize(
+        "exc_cls,status,message,model",
+        [
+            (NotFoundError, 404, "Model not found", "nonexistent-model"),
+            (RateLimitError, 429, "Rate limit exceeded", "text-embedding-ada-002"),
+            (AuthenticationError, 401, "Invalid API key", "text-embedding-ada-002"),
+            (BadRequestError, 400, "Invalid request", "text-embedding-ada-002"),
+        ],
+        ids=["model_not_found", "rate_limit", "auth", "bad_request"],
+    )
+    async def test_embeddings_openai_error_mapping(
+        self, client, mock_openai_service, make_openai_error, exc_cls, status, message, model
+    ):
+        """Test OpenAI status errors map to the matching HTTP status."""
         # Mock OpenAI error
-        mock_openai_service.create_embedding = AsyncMock(
-            side_effect=NotFoundError("Model not found", response=MagicMock(status_code=404), body={})
-        )
-
-        response = client.post("/api/embeddings", json={"model": "nonexistent-model", "prompt": "Test"})
-
-        assert response.status_code == 404
-        data = response.json()
-        assert "error" in data
+        mock_openai_service.create_embedding = AsyncMock(side_effect=make_openai_error(exc_cls, status, message))
 
-    @pytest.mark.asyncio
-    async def test_embeddings_rate_limit_error(self, client, mock_openai_service):
-        """Test handling of rate limit error."""
-        # Mock OpenAI error
-        mock_openai_service.create_embedding = AsyncMock(
-            side_effect=RateLimitError("Rate limit exceeded", response=MagicMock(status_code=429), body={})
-        )
+        response = client.post("/api/embeddings", json={"model": model, "prompt": "Test"})
 
-        response = client.post("/api/embeddings", json={"model": "text-embedding-ada-002", "prompt": "Test"})
-
-        assert response.status_code == 429
-        data = response.json()
-        assert "error" in data
-
-    @pytest.mark.asyncio
-    async def test_embeddings_auth_error(self, client, mock_openai_service):
-        """Test handling of authentication error."""
-        # Mock OpenAI error
-        mock_openai_service.create_embedding = AsyncMock(
-            side_effect=AuthenticationError("Invalid API key", response=MagicMock(status_code=401), body={})
-        )
-
-        response = client.post("/api/embeddings", json={"model": "text-embedding-ada-002", "prompt": "Test"})
-
-        assert response.status_code == 401
-        data = response.json()
-        assert "error" in data
-
-    @pytest.mark.asyncio
-    async def test_embeddings_bad_request(self, client, mock_openai_service):
-        """Test handling of bad request error."""
-        # Mock OpenAI error
-        mock_openai_service.create_embedding = AsyncMock(
-            side_effect=BadRequestError("Invalid request", response=MagicMock(status_code=400), body={})
-        )
-
-        response = client.post("/api/embeddings", json={"model": "text-embedding-ada-002", "prompt": "Test"})
-
-        assert response.status_code == 400
+        assert response.status_code == status
         data = response.json()
         assert "error" in data
 
@@ -10,10 +10,11 @@ class TestTranslationPerformance:
 
     def test_large_model_list_performance(self):
         """Test performance with large model list."""
-        # Create 1000 models
-        models = []
-        for i in range(1000):
-            models.append(Model(id=f"model-{i}", created=1234567890 + i, object="model", owned_by="openai"))
+        # Create 1000 models; the inputs are known-good, so skip pydantic validation
+        models = [
+            Model.model_construct(id=f"model-{i}", created=1234567890 + i, object="model", owned_by="openai")
+            for i in range(1000)
+        ]
 
         start_time = time.time()
         response = EnhancedTranslationService.translate_with_metadata(models)
@@ -6,13 +6,30 @@ This tool helps ensure that your proxy implementation matches the expected
 Ollama API format exactly.
 """
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 import yaml  # type: ignore[import-untyped]
 from jsonschema import Draft7Validator, RefResolver
-from jsonschema.exceptions import ValidationError
+
+# Prefer libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def load_spec(spec_path: str) -> Dict[str, Any]:
+    """Parse an OpenAPI spec file once and cache the result.
+
+    Args:
+        spec_path: Resolved path to the YAML spec
+
+    Returns:
+        Parsed spec as a dictionary
+    """
+    with open(spec_path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER)  # type: ignore[no-any-return]
 
 
 class OpenAPIValidator:
@@ -20,12 +37,17 @@ class OpenAPIValidator:
 
     def __init__(self, spec_path: str):
         """Initialize validator with OpenAPI spec."""
-        self.spec_path = Path(spec_path)
-        with open(self.spec_path) as f:
-            self.spec = yaml.safe_load(f)
+        self.spec_path = Path(spec_path).resolve()
+        self.spec = load_spec(str(self.spec_path))
+
+        # Preload sibling spec files so cross-file $refs resolve from memory
+        store = {f"file://{path}": load_spec(str(path)) for path in self.spec_path.parent.glob("*.yaml")}
 
         # Create resolver for $ref references
-        self.resolver = RefResolver(base_uri=f"file://{self.spec_path.parent}/", referrer=self.spec)
+        self.resolver = RefResolver(base_uri=f"file://{self.spec_path.parent}/", referrer=self.spec, store=store)
+
+        # Compiled validators keyed by (path, method, status_code)
+        self._validators: Dict[Tuple[str, str, int], Draft7Validator] = {}
 
     def get_response_schema(self, path: str, method: str, status_code: int = 200) -> Optional[Dict[str, Any]]:
         """Get response schema for a specific endpoint."""
@@ -44,22 +66,32 @@ class OpenAPIValidator:
         content = response_spec.get("content", {}).get("application/json", {})
         return content.get("schema")  # type: ignore[no-any-return]
 
+    def get_validator(self, path: str, method: str, status_code: int = 200) -> Optional[Draft7Validator]:
+        """Get a cached validator for an endpoint's response schema."""
+        key = (path, method.lower(), status_code)
+        validator = self._validators.get(key)
+        if validator is None:
+            schema = self.get_response_schema(path, method, status_code)
+            if not schema:
+                return None
+            # Resolve any $ref in the schema
+            validator = Draft7Validator(schema, resolver=self.resolver)
+            self._validators[key] = validator
+        return validator
+
     def validate_response(self, path: str, method: str, response_data: Any, status_code: int = 200) -> bool:
-        """Validate response data against schema."""
-        schema = self.get_response_schema(path, method, status_code)
-        if not schema:
+        """Validate response data against schema, reporting every error found."""
+        validator = self.get_validator(path, method, status_code)
+        if validator is None:
             print(f"No schema found for {method} {path} (status {status_code})")
             return False
 
-        try:
-            # Resolve any $ref in the schema
-            validator = Draft7Validator(schema, resolver=self.resolver)
-            validator.validate(response_data)
-            return True
-        except ValidationError as e:
+        valid = True
+        for e in validator.iter_errors(response_data):
+            valid = False
             print(f"Validation error: {e.message}")
             print(f"Failed at path: {' -> '.join(str(p) for p in e.absolute_path)}")
-            return False
+        return valid
 
 
 def test_tags_endpoint(validator: OpenAPIValidator, base_url: str) -> None: